@@ -1,17 +1,41 @@
 # This file makes core_engine a package
 # It allows importing modules from core_engine
+# Exports are resolved lazily (PEP 562) so `import core_engine` stays cheap
 
-from core_engine.ai_core import SelfModifyingAI
-from core_engine.execution.ai_reader import AIReader
-from core_engine.modification.ai_modifier import AIModifier
-from core_engine.learning.ai_analyzer import AIAnalyzer
-from core_engine.learning.ai_optimizer import AIOPTimizer
-from core_engine.modification.ai_utils import AIUtils
-from core_engine.learning.ai_reflector import AIReflector  # NEW: AI Reflection for Runtime Evaluation
-from core_engine.execution.ai_sandbox import AISandbox  # NEW: AI Sandbox for Safe Execution
-from core_engine.learning.ai_fpl import AIFPL  # NEW: AI Fractal Propagation Learning Module
-
-from core_engine.security.ai_safety import AISafety
-from core_engine.security.ai_validation import AIValidation
-from core_engine.security.ai_rollback import AIRollback
-from core_engine.security.ai_safeguard import AISafeguard  # NEW: AI Self-Corruption Prevention
+import importlib
+
+_EXPORTS = {
+    "SelfModifyingAI": "core_engine.ai_core",
+    "AIProjectEngine": "core_engine.ai_project",  # NEW: Package-wide multi-file engine
+    "AIRegistry": "core_engine.ai_registry",  # NEW: Lazily built, shared collaborators
+    "AIDaemon": "core_engine.ai_daemon",  # NEW: Watch mode that reruns only on change
+    "AIReader": "core_engine.execution.ai_reader",
+    "AIModifier": "core_engine.modification.ai_modifier",
+    "AIAnalyzer": "core_engine.learning.ai_analyzer",
+    "AIOPTimizer": "core_engine.learning.ai_optimizer",
+    "AIUtils": "core_engine.modification.ai_utils",
+    "AIReflector": "core_engine.learning.ai_reflector",  # NEW: AI Reflection for Runtime Evaluation
+    "AISandbox": "core_engine.execution.ai_sandbox",  # NEW: AI Sandbox for Safe Execution
+    "AIFPL": "core_engine.learning.ai_fpl",  # NEW: AI Fractal Propagation Learning Module
+
+    "AISafety": "core_engine.security.ai_safety",
+    "AIValidation": "core_engine.security.ai_validation",
+    "AIRollback": "core_engine.security.ai_rollback",
+    "AISafeguard": "core_engine.security.ai_safeguard",  # NEW: AI Self-Corruption Prevention
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Imports an exported class the first time it is accessed."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # Later lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,85 +1,205 @@
+import ast
+import asyncio
+import contextlib
 import logging
-import importlib.util
-import os
-from core_engine.execution.ai_reader import AIReader
-from core_engine.execution.ai_sandbox import AISandbox
-from core_engine.learning.ai_learning_manager import AILearningManager
-from core_engine.modification.ai_function_rewriter import AIFunctionRewriter
-from core_engine.modification.ai_code_expander import AICodeExpander
-from core_engine.security.ai_safeguard import AISafeguard
-from core_engine.security.ai_security import AISecurity
-from core_engine.security.ai_safety import AISafety
-from core_engine.security.ai_validation import AIValidation
-from core_engine.security.ai_rollback import AIRollback
+from core_engine.ai_registry import AIRegistry
+from core_engine.execution.ai_metrics import AIMetrics
+from core_engine.learning.ai_fingerprint_index import AIFingerprintIndex
+from core_engine.modification.ai_generated_store import AIGeneratedNamespace
+from core_engine.modification.ai_source_cache import AISourceCache
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 
 
+def _component(name):
+    """Property that builds the named collaborator on first access."""
+    return property(lambda self: self.registry.get(name), doc=f"Shared `{name}` collaborator.")
+
+
 class SelfModifyingAI:
     """Core AI system that manages self-modification and security."""
 
+    learning_manager = _component('learning_manager')
+    function_rewriter = _component('function_rewriter')
+    code_expander = _component('code_expander')
+    reader = _component('reader')
+    sandbox = _component('sandbox')
+    safeguard = _component('safeguard')
+    security = _component('security')
+    safety = _component('safety')
+    validation = _component('validation')
+    rollback = _component('rollback')
+    call_graph = _component('call_graph')
+
     def __init__(self, file_path):
         """Initialize AI system with execution control and security."""
         self.file_path = file_path
-        self.learning_manager = AILearningManager(file_path)
-        self.function_rewriter = AIFunctionRewriter(file_path)
-        self.code_expander = AICodeExpander(file_path)
-        self.reader = AIReader(file_path)
-        self.sandbox = AISandbox()
-        self.safeguard = AISafeguard(file_path)
-        self.security = AISecurity()
-        self.safety = AISafety()
-        self.validation = AIValidation()
-        self.rollback = AIRollback(file_path)
-        self._load_generated_functions()
+        self.registry = AIRegistry(file_path)  # Collaborators are built lazily and shared
+        self.metrics = AIMetrics.shared()  # Per-phase timings and counters; see metrics.snapshot()
+        self._ai_generated_module = None
+        self.profiler = None  # Set to an AIProfiler to profile sampled cycles
 
-    def _load_generated_functions(self):
-        """Loads AI-generated functions from `ai_generated.py` dynamically."""
-        ai_generated_path = os.path.join(os.path.dirname(__file__),
-            'ai_generated.py')
-        if os.path.exists(ai_generated_path):
-            spec = importlib.util.spec_from_file_location('ai_generated',
-                ai_generated_path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            self.ai_generated_module = module
-            logging.info('✅ AI-generated functions successfully loaded!')
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Times a phase in the metrics and, during a sampled cycle, profiles it."""
+        if self.profiler is None:
+            with self.metrics.phase(name):
+                yield
         else:
-            logging.warning('⚠️ No AI-generated functions found.')
+            # Profiler outermost so snapshot overhead stays out of the phase timings
+            with self.profiler.phase(name), self.metrics.phase(name):
+                yield
+
+    @property
+    def ai_generated_module(self):
+        """AI-generated functions; each one is loaded from the store on first attribute access."""
+        if self._ai_generated_module is None:
+            self._load_generated_functions()
+        return self._ai_generated_module
+
+    def _load_generated_functions(self):
+        """Attaches the indexed generated-function store without executing any function."""
+        self._ai_generated_module = AIGeneratedNamespace(self.registry.get('generated_store'))
+        logging.info('✅ AI-generated function store attached.')
 
     def run(self):
         """Runs the AI engine, ensuring integrity and self-improvement."""
+        if self.profiler is None:
+            return self._run_cycle()
+        with self.profiler.cycle():
+            return self._run_cycle()
+
+    def _timed(self, name, func, *args):
+        """Runs `func(*args)` inside the named phase; used to time work handed to an executor."""
+        with self.phase(name):
+            return func(*args)
+
+    def _changed_functions(self, source):
+        """Names of the functions added or changed since `source`, the pre-cycle text."""
+        cache = AISourceCache.shared()
+        before = AIFingerprintIndex.fingerprint_functions(source, ast.parse(source))
+        after = AIFingerprintIndex.fingerprint_functions(cache.get_source(self.file_path),
+                                                         cache.get_tree(self.file_path))
+        return {name for name, fingerprint in after.items() if before.get(name) != fingerprint}
+
+    def _verify(self, source, stable_generation):
+        """
+        Smoke-tests only the changed functions in a sandbox worker instead of re-running the
+        cycle; on failure the file goes back to `stable_generation`, the pre-cycle backup.
+        """
+        recorded_args = self.function_rewriter.benchmark.recorded_args
+        verdict = self.safeguard.verify_changes(self._changed_functions(source), recorded_args,
+                                                generation=stable_generation)
+        return verdict['ok']
+
+    async def run_async(self, executor=None):
+        """
+        Async variant of `run` that can be awaited from an existing event loop. Blocking file,
+        tracker and sandbox work runs in `executor` (the loop's default when None), and
+        independent phases overlap: function generation with validation. Profiling applies
+        to `run` only.
+        """
+        loop = asyncio.get_running_loop()
+
+        def blocking(name, func, *args):
+            return loop.run_in_executor(executor, self._timed, name, func, *args)
+
+        logging.info('🚀 Starting AI execution (async)...')
+        if not self.safety.check_recursion_depth():
+            logging.error('⚠️ Infinite recursion detected! Halting execution.')
+            return
+        source = await blocking('snapshot', self.reader.snapshot)
+        logging.info('🛠 Creating backup before applying modifications...')
+        # The bytes were read before any edit; failures below restore exactly this generation
+        stable_generation = await blocking('backup', self.rollback.create_backup, source)
+
+        async def learning_cycle():
+            with self.metrics.phase('learning_cycle'):
+                await self.learning_manager.run_learning_cycle_async(executor)
+
+        logging.info('🔄 Running AI Learning Cycle...')
+        await learning_cycle()
+        logging.info('🔄 Running Recursive Function Rewriting...')
+        affected = await blocking('call_graph', self.call_graph.affected_by_changes)
+        modified_functions = await blocking('rewriting', self.function_rewriter.rewrite_and_adapt, affected)
+        if not modified_functions:
+            logging.info(
+                '✅ No significant changes detected, skipping modifications.')
+        logging.info('🔁 Generating new functions while validating the source...')
+        expanded_function, valid = await asyncio.gather(
+            blocking('expansion', self.code_expander.expand_code),
+            blocking('validation', self.validation.validate_code, self.file_path),
+        )
+        if expanded_function:
+            logging.info(
+                f'✅ Successfully expanded new function `{expanded_function}`.')
+        else:
+            logging.info('⚠️ No new functions were generated. Debug required!')
+        if not valid:
+            logging.error('❌ Code validation failed. Aborting modification.')
+            await blocking('rollback', self.rollback.restore_backup, stable_generation)
+            return
+        logging.info('🔍 Running post-modification corruption check...')
+        stable = await blocking('safeguard', self._verify, source, stable_generation)
+        if not stable:
+            logging.error(
+                '⚠️ AI corruption detected. Restoring previous stable version.'
+                )
+            return
+        logging.info('🛠 Recording the verified source as the new stable backup...')
+        await blocking('backup', self.rollback.create_backup)
+        logging.info('📜 Displaying modified AI source code...')
+        await blocking('display', self.reader.display_code)
+
+    def _run_cycle(self):
+        """One engine cycle: back up, learn, rewrite, expand, validate, verify, back up, display."""
         logging.info('🚀 Starting AI execution...')
         if not self.safety.check_recursion_depth():
             logging.error('⚠️ Infinite recursion detected! Halting execution.')
             return
+        source = self.reader.snapshot()  # Pre-cycle state for the diff-only display and verification
+        logging.info('🛠 Creating backup before applying modifications...')
+        with self.phase('backup'):
+            stable_generation = self.rollback.create_backup(source)  # Failures restore exactly this
         logging.info('🔄 Running AI Learning Cycle...')
-        self.learning_manager.run_learning_cycle()
+        with self.phase('learning_cycle'):
+            self.learning_manager.run_learning_cycle()
         logging.info('🔄 Running Recursive Function Rewriting...')
-        modified_functions = self.function_rewriter.rewrite_and_adapt()
+        with self.phase('rewriting'):
+            # Only functions whose own code or callees changed need re-benchmarking
+            affected = self.call_graph.affected_by_changes()
+            modified_functions = self.function_rewriter.rewrite_and_adapt(affected)
         if not modified_functions:
             logging.info(
                 '✅ No significant changes detected, skipping modifications.')
         logging.info('🔁 AI is generating new functions dynamically...')
-        expanded_function = self.code_expander.expand_code()
+        with self.phase('expansion'):
+            expanded_function = self.code_expander.expand_code()
         if expanded_function:
             logging.info(
                 f'✅ Successfully expanded new function `{expanded_function}`.')
         else:
             logging.info('⚠️ No new functions were generated. Debug required!')
         logging.info('🔍 Validating modified AI source code...')
-        if not self.validation.validate_code(self.file_path):
+        with self.phase('validation'):
+            valid = self.validation.validate_code(self.file_path)
+        if not valid:
             logging.error('❌ Code validation failed. Aborting modification.')
+            self.rollback.restore_backup(stable_generation)
             return
-        logging.info('🛠 Creating backup before applying modifications...')
-        self.rollback.create_backup()
         logging.info('🔍 Running post-modification corruption check...')
-        if not self.safeguard.monitor_execution(self.run):
+        with self.phase('safeguard'):
+            stable = self._verify(source, stable_generation)
+        if not stable:
             logging.error(
                 '⚠️ AI corruption detected. Restoring previous stable version.'
                 )
             return
+        logging.info('🛠 Recording the verified source as the new stable backup...')
+        with self.phase('backup'):
+            self.rollback.create_backup()
         logging.info('📜 Displaying modified AI source code...')
-        self.reader.display_code()
+        with self.phase('display'):
+            self.reader.display_code()
 
 
 if __name__ == '__main__':
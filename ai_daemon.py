@@ -0,0 +1,90 @@
+import logging
+import os
+import signal
+import threading
+import time
+from core_engine.ai_project import AIProjectEngine, run_file_pipeline
+from core_engine.ai_registry import AIRegistry
+from core_engine.execution.ai_watcher import AIWatcher
+from core_engine.learning.ai_tracker_state import get_tracker_state
+from core_engine.learning.ai_tracker_store import get_tracker_store
+from core_engine.modification.ai_source_cache import AISourceCache
+
+
+class AIDaemon:
+    """
+    Long-lived watch mode. Collaborators stay warm per file, and a cycle runs only for
+    the targets whose content actually changed. When tracker state changes from
+    outside, the daemon reloads it instead of running a cycle. Between events the
+    daemon blocks in the watcher, so it uses no CPU while idle.
+    """
+
+    def __init__(self, targets, debounce=AIWatcher.DEBOUNCE, poll_interval=AIWatcher.POLL_INTERVAL,
+                 use_inotify=True):
+        self.files = AIProjectEngine(targets).discover_files()
+        self.registries = {path: AIRegistry(path) for path in self.files}
+        self.stores = {}
+        for path in self.files:
+            store = get_tracker_store(path)
+            self.stores[id(store)] = store
+        self.tracker_paths = {os.path.abspath(tracker_path)
+                              for store in self.stores.values() for tracker_path in store.watch_paths()}
+        self.watcher = AIWatcher(set(self.files) | self.tracker_paths, debounce=debounce,
+                                 poll_interval=poll_interval, use_inotify=use_inotify)
+        self._stop = threading.Event()
+
+    def stop(self, *_):
+        """Stops the daemon after the current wait or cycle."""
+        self._stop.set()
+
+    def reload_tracker_state(self):
+        """Drops cached tracker state so the next cycle sees changes made by other processes."""
+        for store in self.stores.values():
+            store.reload()
+            get_tracker_state(store).reload()
+        for registry in self.registries.values():
+            if "parser" in registry.built():
+                registry.get("parser").fingerprints.reload()
+            if "call_graph" in registry.built():
+                registry.get("call_graph").reload()
+        logging.info("🔃 Tracker state changed on disk; reloaded.")
+
+    def run_cycle(self, changed_files):
+        """Runs one incremental cycle over the changed target files."""
+        results = {}
+        written = {}  # target -> hash of the content the engine left it with
+        for path in sorted(changed_files):
+            if not os.path.exists(path):
+                logging.info(f"🗑 {path} was removed; skipping.")
+                continue
+            started = time.perf_counter()
+            results[path] = run_file_pipeline(self.registries[path])
+            written[path] = AISourceCache.shared().cached_hash(path)
+            logging.info(f"⚡ Cycle for {path}: {results[path]['status']} "
+                         f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+        # The engine's own writes must not retrigger a cycle, but an edit saved while the
+        # cycle ran must: targets are acknowledged at the engine's own content hash, and
+        # only the tracker files (which self-reload on outside writes) are re-hashed
+        self.watcher.acknowledge(self.tracker_paths, {path: digest for path, digest in written.items() if digest})
+        return results
+
+    def run(self, install_signal_handlers=True):
+        """Watches until `stop()` is called (or SIGINT/SIGTERM when run from the main thread)."""
+        if install_signal_handlers and threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, self.stop)
+            signal.signal(signal.SIGTERM, self.stop)
+
+        logging.info(f"🛰 Watch mode started for {len(self.files)} files.")
+        try:
+            while not self._stop.is_set():
+                changed = self.watcher.wait(timeout=0.5)  # Wakes periodically only to honour stop()
+                if not changed:
+                    continue
+                if changed & self.tracker_paths:
+                    self.reload_tracker_state()
+                targets = changed - self.tracker_paths
+                if targets:
+                    self.run_cycle(targets)
+        finally:
+            self.watcher.close()
+            logging.info("🛑 Watch mode stopped.")
@@ -0,0 +1,133 @@
+import logging
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from core_engine.ai_registry import AIRegistry
+from core_engine.execution.ai_sandbox_pool import AISandboxPool
+
+
+def _init_worker(sandbox_workers):
+    """Gives every project worker its own small sandbox pool instead of one per core."""
+    AISandboxPool._shared = AISandboxPool(workers=sandbox_workers)
+
+
+def _process_file(file_path):
+    """Runs the analyze → rewrite → validate → track pipeline on one file."""
+    return run_file_pipeline(AIRegistry(file_path))
+
+
+def run_file_pipeline(registry):
+    """Runs the pipeline with the collaborators of `registry`, which may be kept warm between runs."""
+    start = time.perf_counter()
+    try:
+        # Validated first: analysis, the call graph and rewriting all need a parsed module,
+        # and the rewriter does not write the file, so the result holds for the whole run
+        if not registry.get("validation").validate_code(registry.file_path):
+            return {
+                "status": "invalid",
+                "functions_analyzed": 0,
+                "rewrites_accepted": [],
+                "elapsed": time.perf_counter() - start,
+            }
+
+        analyzer = registry.get("analyzer")
+        function_tracker = registry.get("function_tracker")
+        rewriter = registry.get("function_rewriter")
+
+        with function_tracker.store.batch():
+            function_report = analyzer.analyze_code(changed_only=True)
+            for function_name, details in function_report.items():
+                if function_tracker.has_changed(function_name, details):
+                    function_tracker.log_modification(function_name, details)
+            call_graph = registry.get("call_graph")
+            rewritten = rewriter.rewrite_and_adapt(call_graph.affected_by_changes())
+
+        return {
+            "status": "ok",
+            "functions_analyzed": len(function_report),
+            "rewrites_accepted": rewritten,
+            "elapsed": time.perf_counter() - start,
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error": f"{type(e).__name__}: {e}",
+            "traceback": traceback.format_exc(),
+            "elapsed": time.perf_counter() - start,
+        }
+
+
+class AIProjectEngine:
+    """Runs the self-modification pipeline over a whole package, sharding files across processes."""
+
+    SKIPPED_DIRECTORIES = {"__pycache__"}
+
+    def __init__(self, targets, max_workers=None, sandbox_workers=1):
+        """`targets` is a directory, a module path, or a list of either."""
+        self.targets = [targets] if isinstance(targets, (str, os.PathLike)) else list(targets)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.sandbox_workers = sandbox_workers
+
+    def discover_files(self):
+        """Expands the targets into a sorted list of Python files."""
+        files = set()
+        for target in self.targets:
+            target = os.path.abspath(target)
+            if os.path.isfile(target):
+                files.add(target)
+                continue
+            for dirpath, dirnames, filenames in os.walk(target):
+                dirnames[:] = [d for d in dirnames
+                               if d not in self.SKIPPED_DIRECTORIES and not d.startswith(".")]
+                files.update(os.path.join(dirpath, f) for f in filenames if f.endswith(".py"))
+        return sorted(files)
+
+    def _run_pool(self, files, max_workers):
+        """Processes files in one executor; returns (results, files lost to a crashed worker)."""
+        results, crashed = {}, []
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(self.sandbox_workers,)) as executor:
+            futures = {executor.submit(_process_file, file_path): file_path for file_path in files}
+            for future in as_completed(futures):
+                file_path = futures[future]
+                try:
+                    results[file_path] = future.result()
+                except BrokenProcessPool:
+                    crashed.append(file_path)
+                except Exception as e:
+                    results[file_path] = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+        return results, crashed
+
+    def run(self):
+        """Runs every file and merges the per-file results into one report."""
+        start = time.perf_counter()
+        files = self.discover_files()
+        logging.info(f"🚀 Processing {len(files)} files with {self.max_workers} workers...")
+
+        results, crashed = self._run_pool(files, min(self.max_workers, len(files) or 1))
+
+        # A hard crash poisons every pending future; retry those files one by one to isolate the culprit
+        for file_path in crashed:
+            retry, still_crashed = self._run_pool([file_path], 1)
+            results.update(retry)
+            if still_crashed:
+                results[file_path] = {"status": "error", "error": "Worker process crashed"}
+                logging.error(f"❌ Worker crashed while processing {file_path}")
+
+        report = {"files": results, "summary": self.summarize(results)}
+        report["summary"]["elapsed"] = time.perf_counter() - start
+        logging.info(f"✅ Project cycle completed: {report['summary']}")
+        return report
+
+    @staticmethod
+    def summarize(results):
+        """Aggregates per-file results into project-wide totals."""
+        summary = {"files": len(results), "ok": 0, "invalid": 0, "error": 0,
+                   "functions_analyzed": 0, "rewrites_accepted": 0}
+        for result in results.values():
+            summary[result["status"]] += 1
+            summary["functions_analyzed"] += result.get("functions_analyzed", 0)
+            summary["rewrites_accepted"] += len(result.get("rewrites_accepted", ()))
+        return summary
@@ -0,0 +1,80 @@
+import importlib
+import threading
+
+
+class AIRegistry:
+    """
+    Builds engine collaborators on first use and shares one instance of each per engine.
+    Modules are imported only when a collaborator that needs them is first requested,
+    so read-only commands never pay for the rewriting and learning stack.
+    """
+
+    # name -> (module, class, takes file_path, {constructor keyword: collaborator name})
+    COMPONENTS = {
+        "parser": ("core_engine.modification.ai_ast_parser", "AIASTParser", True, {}),
+        "modifier": ("core_engine.modification.ai_modifier", "AIModifier", True, {"ast_parser": "parser"}),
+        "function_tracker": ("core_engine.learning.ai_function_tracker", "AIFunctionTracker", True, {}),
+        "fractal_tracker": ("core_engine.learning.ai_fractal_tracker", "AIFractalTracker", True, {}),
+        "analyzer": ("core_engine.learning.ai_analyzer", "AIAnalyzer", True, {"ast_parser": "parser"}),
+        "optimizer": ("core_engine.learning.ai_optimizer", "AIOPTimizer", True, {"modifier": "modifier"}),
+        "call_graph": ("core_engine.learning.ai_call_graph", "AICallGraph", True, {}),
+        "fpl": ("core_engine.learning.ai_fpl", "AIFPL", True, {
+            "modifier": "modifier",
+            "fractal_tracker": "fractal_tracker",
+            "function_tracker": "function_tracker",
+            "call_graph": "call_graph",
+        }),
+        "sandbox": ("core_engine.execution.ai_sandbox", "AISandbox", False, {}),
+        "generated_store": ("core_engine.modification.ai_generated_store", "AIGeneratedStore", True, {}),
+        "code_expander": ("core_engine.modification.ai_code_expander", "AICodeExpander", True, {
+            "sandbox": "sandbox",
+            "function_tracker": "function_tracker",
+            "generated_store": "generated_store",
+        }),
+        "function_rewriter": ("core_engine.modification.ai_function_rewriter", "AIFunctionRewriter", True, {
+            "sandbox": "sandbox",
+            "function_tracker": "function_tracker",
+        }),
+        "learning_manager": ("core_engine.learning.ai_learning_manager", "AILearningManager", True, {
+            "fpl": "fpl",
+            "fractal_tracker": "fractal_tracker",
+            "function_tracker": "function_tracker",
+            "analyzer": "analyzer",
+            "optimizer": "optimizer",
+            "modifier": "modifier",
+            "code_expander": "code_expander",
+        }),
+        "reader": ("core_engine.execution.ai_reader", "AIReader", True, {}),
+        "rollback": ("core_engine.security.ai_rollback", "AIRollback", True, {}),
+        "safeguard": ("core_engine.security.ai_safeguard", "AISafeguard", True, {
+            "rollback": "rollback",
+            "sandbox": "sandbox",
+        }),
+        "security": ("core_engine.security.ai_security", "AISecurity", False, {}),
+        "safety": ("core_engine.security.ai_safety", "AISafety", False, {}),
+        "validation": ("core_engine.security.ai_validation", "AIValidation", False, {}),
+    }
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._instances = {}
+        self._lock = threading.RLock()
+
+    def get(self, name):
+        """Returns the shared collaborator `name`, building it (and its dependencies) on first use."""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if name not in self._instances:
+                module_name, class_name, takes_path, dependencies = self.COMPONENTS[name]
+                cls = getattr(importlib.import_module(module_name), class_name)
+                kwargs = {keyword: self.get(dependency) for keyword, dependency in dependencies.items()}
+                args = (self.file_path,) if takes_path else ()
+                self._instances[name] = cls(*args, **kwargs)
+            return self._instances[name]
+
+    def built(self):
+        """Names of the collaborators constructed so far."""
+        return sorted(self._instances)
@@ -0,0 +1,239 @@
+"""
+Scalability benchmark: generates synthetic target modules with 100 to 100k functions
+(loops, nested defs, classes, large bodies) and times every subsystem separately.
+Each size runs in a fresh interpreter so its peak RSS is its own. Results are printed
+as JSON and can be compared against a stored baseline.
+
+    python benchmarks/bench_engine.py [--sizes 100 1000 10000 100000]
+        [--save-baseline base.json] [--baseline base.json --tolerance 0.25 --fail-on-regression]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+PACKAGE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+REWRITE_LIMIT = 1000  # rewrite_and_adapt sandboxes every function; larger modules skip it by default
+GENERATED_FUNCTIONS = 500
+
+
+def _loop_function(index, rng):
+    return (f"def loop_{index}(items):\n"
+            f"    total = 0\n"
+            f"    for item in items:\n"
+            f"        for part in range({rng.randint(2, 9)}):\n"
+            f"            total += math.sqrt(abs(item) + part)\n"
+            f"    return total\n")
+
+
+def _nested_function(index, rng):
+    return (f"def nested_{index}(x):\n"
+            f"    def inner(y):\n"
+            f"        def innermost(z):\n"
+            f"            return z * {rng.randint(1, 9)}\n"
+            f"        return innermost(y) + 1\n"
+            f"    if x > 0:\n"
+            f"        return inner(x)\n"
+            f"    return [inner(v) for v in range(3) if v]\n")
+
+
+def _class_function(index, rng):
+    return (f"class Shape{index}:\n"
+            f"    def __init__(self, size):\n"
+            f"        self.size = size\n"
+            f"\n"
+            f"    def area_{index}(self):\n"
+            f"        return self.size * {rng.randint(1, 9)}\n"
+            f"\n"
+            f"    def grow_{index}(self, steps):\n"
+            f"        while steps:\n"
+            f"            self.size += 1\n"
+            f"            steps -= 1\n"
+            f"        return self.size\n")
+
+
+def _large_function(index, rng):
+    body = "".join(f"    v{line} = a * {rng.randint(1, 99)} + {line}\n" for line in range(40))
+    return f"def large_{index}(a):\n{body}    return v39\n"
+
+
+SHAPES = (_loop_function, _nested_function, _class_function, _large_function)
+
+
+def generate_module(functions, seed=0):
+    """Returns the source of a module with `functions` top-level definitions of rotating shapes."""
+    rng = random.Random(seed)
+    parts = ["import math\n"]
+    parts.extend(SHAPES[index % len(SHAPES)](index, rng) for index in range(functions))
+    return "\n\n".join(parts)
+
+
+def run_size(functions, rewrite_limit, trace_memory):
+    """Runs inside a fresh interpreter: times each subsystem on one synthetic module."""
+    import logging
+    import resource
+    import tracemalloc
+    sys.path.insert(0, os.path.dirname(PACKAGE_DIR))
+    logging.disable(logging.CRITICAL)
+
+    from core_engine.ai_core import SelfModifyingAI
+    from core_engine.learning.ai_analyzer import AIAnalyzer
+    from core_engine.learning.ai_function_tracker import AIFunctionTracker
+    from core_engine.learning.ai_tracker_state import AITrackerState
+    from core_engine.modification.ai_ast_parser import AIASTParser
+    from core_engine.modification.ai_function_rewriter import AIFunctionRewriter
+    from core_engine.modification.ai_generated_store import AIGeneratedStore
+    from core_engine.modification.ai_modifier import AIModifier
+    from core_engine.modification.ai_source_cache import AISourceCache
+    from core_engine.security.ai_security import AISecurity
+    from core_engine.security.ai_validation import AIValidation
+
+    work_dir = tempfile.mkdtemp(prefix="genesisx_bench_")
+    try:
+        target = os.path.join(work_dir, "target.py")
+        source = generate_module(functions)
+        with open(target, "w", encoding="utf-8") as file:
+            file.write(source)
+
+        cache = AISourceCache.shared()
+        parser = AIASTParser(target)
+        analyzer = AIAnalyzer(target, parser)
+        results = {}
+
+        def timed(name, func):
+            if trace_memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            func()
+            entry = {"seconds": time.perf_counter() - start}
+            if trace_memory:
+                entry["peak_traced_bytes"] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            results[name] = entry
+
+        def parse():
+            cache.invalidate(target)
+            parser.parse_code()
+
+        def modify():
+            AIModifier(target, parser).modify_function(f"large_{(functions // 2) // 4 * 4 + 3}",
+                                                       "return a + 1")
+
+        def validate():
+            AIValidation().validate_code(target)
+            text = cache.get_source(target)
+            AIValidation().validate_ast_modification(text)
+            AISecurity().enforce_security_policies(text)
+
+        def track():
+            tracker = AIFunctionTracker(target)
+            with tracker.store.batch():
+                for index in range(functions):
+                    tracker.log_modification(f"function_{index}", index)
+            AITrackerState(tracker.store)  # Cold reload of the compact state
+
+        def load_generated():
+            store = AIGeneratedStore(target)
+            store.add_many([(f"generated_{index}", f"def generated_{index}(x):\n    return x * {index}\n")
+                            for index in range(GENERATED_FUNCTIONS)])
+            ai = SelfModifyingAI(target)
+            ai._load_generated_functions()
+            for index in range(GENERATED_FUNCTIONS):
+                getattr(ai.ai_generated_module, f"generated_{index}")
+
+        timed("parse", parse)
+        timed("analyze", analyzer.analyze_code)
+        timed("analyze_incremental", lambda: analyzer.analyze_code(changed_only=True))
+        timed("modify_function", modify)
+        if functions <= rewrite_limit:
+            timed("rewrite_and_adapt", AIFunctionRewriter(target).rewrite_and_adapt)
+        timed("validation_security", validate)
+        timed("tracker_persistence", track)
+        timed("load_generated_functions", load_generated)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)  # Target plus its tracker and snapshot files
+
+    return {
+        "functions": functions,
+        "source_bytes": len(source.encode("utf-8")),
+        "subsystems": results,
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def compare(current, baseline, tolerance):
+    """Returns `(comparison, regressions)`: current/baseline time ratios per size and subsystem."""
+    baseline_sizes = {str(entry["functions"]): entry for entry in baseline.get("sizes", [])}
+    comparison, regressions = {}, []
+    for entry in current["sizes"]:
+        base = baseline_sizes.get(str(entry["functions"]))
+        if base is None:
+            continue
+        ratios = {}
+        for name, result in entry["subsystems"].items():
+            base_result = base["subsystems"].get(name)
+            if not base_result or not base_result["seconds"]:
+                continue
+            ratio = result["seconds"] / base_result["seconds"]
+            ratios[name] = round(ratio, 3)
+            if ratio > 1 + tolerance:
+                regressions.append(f"{name} @ {entry['functions']} functions: {ratio:.2f}x baseline")
+        if base.get("peak_rss_kib"):
+            ratios["peak_rss"] = round(entry["peak_rss_kib"] / base["peak_rss_kib"], 3)
+        comparison[str(entry["functions"])] = ratios
+    return comparison, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--rewrite-limit", type=int, default=REWRITE_LIMIT,
+                        help="Largest module on which rewrite_and_adapt is timed")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Also record tracemalloc peaks per subsystem (slows the timings)")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--save-baseline", metavar="FILE", help="Write these results to FILE")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown before a subsystem counts as regressed")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        print(json.dumps(run_size(args.worker, args.rewrite_limit, args.trace_memory)))
+        return
+
+    if os.path.basename(PACKAGE_DIR) != "core_engine":
+        sys.exit(f"The package directory must be named core_engine (found {PACKAGE_DIR})")
+
+    sizes = []
+    for functions in args.sizes:
+        command = [sys.executable, __file__, "--worker", str(functions), "--rewrite-limit", str(args.rewrite_limit)]
+        if args.trace_memory:
+            command.append("--trace-memory")
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        sizes.append(json.loads(output.strip().splitlines()[-1]))
+
+    results = {"benchmark": "engine_scaling", "python": sys.version.split()[0], "sizes": sizes}
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            results["comparison"], regressions = compare(results, json.load(file), args.tolerance)
+        results["regressions"] = regressions
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=4)
+    print(json.dumps(results, indent=4))
+
+    if args.fail_on_regression and regressions:
+        sys.exit(f"{len(regressions)} subsystem(s) regressed beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Cold-start benchmark: times `import core_engine` plus a read-only `display_code`
+in fresh interpreters and reports the median as JSON.
+
+    python benchmarks/bench_startup.py [--runs 10] [--max-ms 250]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PACKAGE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Runs in a fresh interpreter; prints elapsed seconds and the core_engine modules it loaded
+STARTUP_SCRIPT = """
+import logging, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {parent!r})
+import core_engine
+ai = core_engine.SelfModifyingAI({target!r})
+logging.disable(logging.INFO)
+ai.reader.display_code()
+elapsed = time.perf_counter() - start
+print(elapsed, len([m for m in sys.modules if m.startswith("core_engine")]))
+"""
+
+
+def measure(runs, target):
+    """Returns per-run cold-start times and the number of engine modules imported."""
+    script = STARTUP_SCRIPT.format(parent=os.path.dirname(PACKAGE_DIR), target=target)
+    times, modules = [], 0
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", script], check=True,
+                                capture_output=True, text=True).stdout.split()
+        times.append(float(output[0]))
+        modules = int(output[1])
+    return times, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--target", default=os.path.join(PACKAGE_DIR, "ai_core.py"))
+    parser.add_argument("--max-ms", type=float, help="Exit non-zero if the median exceeds this")
+    args = parser.parse_args()
+
+    if os.path.basename(PACKAGE_DIR) != "core_engine":
+        sys.exit(f"The package directory must be named core_engine (found {PACKAGE_DIR})")
+
+    times, modules = measure(args.runs, args.target)
+    median_ms = statistics.median(times) * 1000
+    print(json.dumps({
+        "benchmark": "startup_display_code",
+        "runs": args.runs,
+        "median_ms": round(median_ms, 3),
+        "min_ms": round(min(times) * 1000, 3),
+        "max_ms": round(max(times) * 1000, 3),
+        "engine_modules_imported": modules,
+    }, indent=4))
+
+    if args.max_ms is not None and median_ms > args.max_ms:
+        sys.exit(f"Cold start regressed: {median_ms:.1f} ms > {args.max_ms} ms")
+
+
+if __name__ == "__main__":
+    main()
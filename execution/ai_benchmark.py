@@ -0,0 +1,159 @@
+import inspect
+import logging
+import statistics
+import time
+from core_engine.execution.ai_sandbox import AISandbox
+
+# Argument values tried, in order, when no recorded arguments exist for a function
+CANDIDATE_VALUES = (1, 2.5, "a", [1, 2, 3], {"a": 1}, None)
+MAX_ARG_SETS = 3
+MAX_LOOPS = 1 << 20
+
+
+def _load_function(function_name, function_code, prelude):
+    """Compiles one version of a function in its own fresh namespace."""
+    namespace = {"__name__": "__benchmark__"}
+    exec(prelude, namespace)
+    exec(function_code, namespace)
+    return namespace[function_name]
+
+
+def _synthesize_arg_sets(function):
+    """Finds argument tuples the function accepts without raising."""
+    try:
+        parameters = inspect.signature(function).parameters.values()
+    except (TypeError, ValueError):
+        return []
+    required = [p for p in parameters
+                if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) and p.default is p.empty]
+
+    arg_sets = []
+    for value in CANDIDATE_VALUES:
+        args = (value,) * len(required)
+        try:
+            function(*args)
+        except Exception:
+            continue
+        arg_sets.append(args)
+        if not required or len(arg_sets) == MAX_ARG_SETS:
+            break
+    return arg_sets
+
+
+def _time_calls(function, arg_sets, loops):
+    start = time.perf_counter()
+    for _ in range(loops):
+        for args in arg_sets:
+            function(*args)
+    return time.perf_counter() - start
+
+
+def _benchmark_job(function_name, original_code, rewritten_code, arg_sets, prelude,
+                   repeats, warmup, min_sample_time):
+    """
+    Runs inside a sandbox worker: calibrates a loop count, warms up, then times the
+    original and rewritten versions in interleaved repeats. Returns per-call samples.
+    """
+    logging.disable(logging.CRITICAL)  # Instrumented rewrites must not flood the worker's log
+    try:
+        original = _load_function(function_name, original_code, prelude)
+        rewritten = _load_function(function_name, rewritten_code, prelude)
+
+        arg_sets = [tuple(args) for args in arg_sets] if arg_sets else _synthesize_arg_sets(original)
+        if not arg_sets:
+            return {"skipped": "no argument set accepted by the original function"}
+        try:
+            _time_calls(rewritten, arg_sets, 1)
+        except Exception as e:
+            return {"broken": f"{type(e).__name__}: {e}"}
+
+        loops = 1
+        while loops < MAX_LOOPS and _time_calls(original, arg_sets, loops) < min_sample_time:
+            loops *= 2
+
+        for _ in range(warmup):
+            _time_calls(original, arg_sets, loops)
+            _time_calls(rewritten, arg_sets, loops)
+
+        calls = loops * len(arg_sets)
+        samples = {"original": [], "rewritten": []}
+        for _ in range(repeats):
+            samples["original"].append(_time_calls(original, arg_sets, loops) / calls)
+            samples["rewritten"].append(_time_calls(rewritten, arg_sets, loops) / calls)
+        samples["loops"] = loops
+        samples["arg_sets"] = len(arg_sets)
+        return samples
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+class AIBenchmark:
+    """Micro-benchmarks original and rewritten functions and judges the difference."""
+
+    REPEATS = 9
+    WARMUP = 2
+    MIN_SAMPLE_TIME = 0.005  # Seconds per timed sample after loop calibration
+    NOISE_THRESHOLD = 0.02  # Relative median change treated as noise
+    TIMEOUT = 10
+
+    def __init__(self, sandbox=None):
+        self.sandbox = sandbox or AISandbox()
+        self.recorded_args = {}  # function name -> list of argument tuples
+
+    def record_args(self, function_name, *args):
+        """Records a real argument tuple for a function; recorded sets beat synthesized ones."""
+        self.recorded_args.setdefault(function_name, []).append(args)
+
+    def compare(self, function_name, original_code, rewritten_code, prelude=""):
+        """Benchmarks one rewrite and returns its report."""
+        return self.compare_many([(function_name, original_code, rewritten_code)], prelude)[0]
+
+    def compare_many(self, candidates, prelude=""):
+        """
+        Benchmarks `(function_name, original_code, rewritten_code)` triples in parallel
+        across the sandbox pool. Each report carries a `verdict`: "speedup", "regression",
+        "neutral", "broken" (the rewrite raises where the original did not) or
+        "inconclusive" (no usable arguments, or the benchmark itself failed).
+        """
+        jobs = [{
+            "target": "core_engine.execution.ai_benchmark:_benchmark_job",
+            "args": (name, original, rewritten, self.recorded_args.get(name), prelude,
+                     self.REPEATS, self.WARMUP, self.MIN_SAMPLE_TIME),
+        } for name, original, rewritten in candidates]
+        results = self.sandbox.pool.run_batch(jobs, timeout=self.TIMEOUT)
+        return [self._report(result) for result in results]
+
+    def _report(self, result):
+        if not result["ok"]:
+            return {"verdict": "inconclusive", "reason": result["error"]}
+        samples = result["value"]
+        if "skipped" in samples:
+            return {"verdict": "inconclusive", "reason": samples["skipped"]}
+        if "broken" in samples:
+            return {"verdict": "broken", "reason": samples["broken"]}
+
+        original = self.summarize(samples["original"])
+        rewritten = self.summarize(samples["rewritten"])
+        change = (rewritten["median"] - original["median"]) / original["median"] if original["median"] else 0.0
+
+        # Significant only if the interquartile ranges do not overlap and the shift is above noise
+        separated = rewritten["q3"] < original["q1"] or rewritten["q1"] > original["q3"]
+        if separated and abs(change) >= self.NOISE_THRESHOLD:
+            verdict = "speedup" if change < 0 else "regression"
+        else:
+            verdict = "neutral"
+
+        return {
+            "verdict": verdict,
+            "change": change,
+            "original": original,
+            "rewritten": rewritten,
+            "loops": samples["loops"],
+            "arg_sets": samples["arg_sets"],
+        }
+
+    @staticmethod
+    def summarize(samples):
+        """Median and interquartile range of per-call timings."""
+        q1, median, q3 = statistics.quantiles(samples, n=4, method="inclusive")
+        return {"median": median, "q1": q1, "q3": q3, "iqr": q3 - q1}
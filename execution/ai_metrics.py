@@ -0,0 +1,122 @@
+import contextlib
+import json
+import os
+import threading
+import time
+
+
+class _PhaseTimer:
+    """Context manager that adds one phase's wall and CPU time to the metrics."""
+
+    __slots__ = ("metrics", "name", "wall_start", "cpu_start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics._record_phase(self.name, time.perf_counter() - self.wall_start,
+                                   time.process_time() - self.cpu_start)
+        return False
+
+
+class AIMetrics:
+    """
+    Per-phase timings and engine counters. Disabled metrics cost one attribute check
+    per call: `phase()` returns a shared no-op context and `incr()` returns at once.
+    """
+
+    COUNTERS = (
+        "functions_analyzed",
+        "functions_rewritten",  # Written to the source by AIModifier
+        "rewrites_accepted",  # Benchmarked rewrites the rewriter keeps; not written to disk
+        "functions_skipped",
+        "functions_rejected",
+        "functions_generated",
+        "bytes_read",
+        "bytes_written",
+        "parses",
+    )
+    PROMETHEUS_PREFIX = "genesisx"
+
+    _NULL_PHASE = contextlib.nullcontext()
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    @classmethod
+    def shared(cls):
+        """Returns the process-wide metrics; set GENESISX_METRICS=0 to disable them."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls(enabled=os.environ.get("GENESISX_METRICS", "1") != "0")
+        return cls._shared
+
+    def reset(self):
+        """Clears every phase timing and counter."""
+        with self._lock:
+            self._phases = {}  # name -> [calls, wall seconds, cpu seconds]
+            self._counters = dict.fromkeys(self.COUNTERS, 0)
+
+    def phase(self, name):
+        """Times a block: `with metrics.phase("validation"): ...`."""
+        if not self.enabled:
+            return self._NULL_PHASE
+        return _PhaseTimer(self, name)
+
+    def _record_phase(self, name, wall, cpu):
+        with self._lock:
+            totals = self._phases.setdefault(name, [0, 0.0, 0.0])
+            totals[0] += 1
+            totals[1] += wall
+            totals[2] += cpu
+
+    def incr(self, counter, amount=1):
+        """Adds `amount` to a counter."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    def snapshot(self):
+        """Returns a copy of all phase timings and counters."""
+        with self._lock:
+            return {
+                "phases": {
+                    name: {"calls": calls, "wall_seconds": wall, "cpu_seconds": cpu}
+                    for name, (calls, wall, cpu) in self._phases.items()
+                },
+                "counters": dict(self._counters),
+            }
+
+    def to_json(self, indent=4):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self):
+        """Renders the snapshot in the Prometheus text exposition format."""
+        prefix = self.PROMETHEUS_PREFIX
+        snapshot = self.snapshot()
+        lines = []
+        for metric, field, help_text in (
+            ("phase_calls_total", "calls", "Number of times each engine phase ran."),
+            ("phase_wall_seconds_total", "wall_seconds", "Wall-clock time spent in each engine phase."),
+            ("phase_cpu_seconds_total", "cpu_seconds", "CPU time spent in each engine phase."),
+        ):
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            for name, phase in sorted(snapshot["phases"].items()):
+                lines.append(f'{prefix}_{metric}{{phase="{name}"}} {phase[field]}')
+        for counter, value in sorted(snapshot["counters"].items()):
+            lines.append(f"# TYPE {prefix}_{counter}_total counter")
+            lines.append(f"{prefix}_{counter}_total {value}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,89 @@
+import cProfile
+import logging
+import os
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+
+
+class AIProfiler:
+    """
+    Opt-in cycle profiler. For every sampled cycle each phase is wrapped in cProfile
+    and tracemalloc, producing `<dir>/cycleNNNN_<phase>.pstats`, a readable
+    `.stats.txt` of the top functions and an `.alloc.txt` of the top allocation sites.
+    """
+
+    TRACEBACK_FRAMES = 25
+    IGNORED_FRAMES = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    )
+
+    def __init__(self, output_dir, every=1, top_n=25):
+        """Profiles one cycle in every `every` cycles and keeps the `top_n` entries per report."""
+        self.output_dir = os.path.abspath(output_dir)
+        self.every = max(1, every)
+        self.top_n = top_n
+        self.cycle_count = 0
+        self.active = False
+        self._phase_depth = 0
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    @contextmanager
+    def cycle(self):
+        """Marks one engine cycle; yields True if this cycle is sampled."""
+        if self.active:  # Nested cycle (e.g. a recursive run): fold into the outer one
+            yield True
+            return
+        self.cycle_count += 1
+        if (self.cycle_count - 1) % self.every:
+            yield False
+            return
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(self.TRACEBACK_FRAMES)
+        self.active = True
+        logging.info(f"⏱ Profiling cycle {self.cycle_count} into {self.output_dir}")
+        try:
+            yield True
+        finally:
+            self.active = False
+            if started_tracing:
+                tracemalloc.stop()
+
+    @contextmanager
+    def phase(self, name):
+        """Profiles one phase of a sampled cycle; nested phases count toward their parent."""
+        if not self.active or self._phase_depth:
+            yield
+            return
+
+        self._phase_depth += 1
+        profile = cProfile.Profile()
+        before = tracemalloc.take_snapshot().filter_traces(self.IGNORED_FRAMES)
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            after = tracemalloc.take_snapshot().filter_traces(self.IGNORED_FRAMES)
+            self._phase_depth -= 1
+            self._write_reports(name, profile, before, after)
+
+    def _write_reports(self, name, profile, before, after):
+        prefix = os.path.join(self.output_dir, f"cycle{self.cycle_count:04d}_{name}")
+        profile.dump_stats(prefix + ".pstats")
+
+        with open(prefix + ".stats.txt", "w", encoding="utf-8") as file:
+            pstats.Stats(profile, stream=file).sort_stats("cumulative").print_stats(self.top_n)
+
+        current, peak = tracemalloc.get_traced_memory()
+        with open(prefix + ".alloc.txt", "w", encoding="utf-8") as file:
+            file.write(f"Phase: {name} (cycle {self.cycle_count})\n")
+            file.write(f"Traced memory: current={current} B, peak={peak} B\n\n")
+            file.write(f"Top {self.top_n} allocation sites by growth during the phase:\n")
+            for stat in after.compare_to(before, "lineno")[:self.top_n]:
+                file.write(f"{stat}\n")
+        logging.info(f"⏱ Wrote profile reports for phase '{name}': {prefix}.*")
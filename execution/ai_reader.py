@@ -1,18 +1,92 @@
+import ast
+import difflib
+import itertools
 import logging
 from core_engine.modification.ai_utils import AIUtils  # Use centralized file handling
 
 class AIReader:
     """Handles reading and displaying AI's source code."""
 
+    PAGE_SIZE = 200  # Lines per log record when streaming
+
     def __init__(self, file_path):
         self.file_path = file_path
         self.utils = AIUtils(file_path)  # Use centralized file handler
+        self._snapshot = None
+
+    def snapshot(self):
+        """Records (and returns) the pre-cycle source so `display_code` can show only what the cycle changed."""
+        self._snapshot = self.utils.read_source_code()
+        return self._snapshot
+
+    def iter_lines(self, start=1, stop=None):
+        """Lazily streams lines `start`..`stop` (1-based, inclusive) without loading the whole file."""
+        with open(self.file_path, "r", encoding="utf-8") as file:
+            yield from itertools.islice(file, start - 1, stop)
+
+    def iter_pages(self, page_size=PAGE_SIZE, start=1, stop=None):
+        """Yields the file (or a line range of it) in pages of `page_size` lines."""
+        lines = self.iter_lines(start, stop)
+        while True:
+            page = list(itertools.islice(lines, page_size))
+            if not page:
+                return
+            yield "".join(page)
 
     def display_code(self):
-        """Displays the AI's own code."""
+        """Displays the AI's own code: the diff since `snapshot()` if one was taken, else the full file."""
+        if self._snapshot is not None:
+            return self.display_diff()
         try:
-            source_code = self.utils.read_source_code()  # Read using AIUtils
             logging.info(f"📜 AI source code:\n" + "-" * 40)
-            logging.info(source_code.strip())
+            for page in self.iter_pages():
+                logging.info(page.rstrip("\n"))
+        except Exception as e:
+            logging.error(f"Error reading file: {e}")
+
+    def display_page(self, page, page_size=PAGE_SIZE):
+        """Displays one page (0-based) of the file."""
+        try:
+            start = page * page_size + 1
+            text = "".join(self.iter_lines(start, start + page_size - 1))
+            logging.info(f"📜 AI source code, lines {start}-{start + page_size - 1}:\n" + "-" * 40)
+            logging.info(text.rstrip("\n"))
+        except Exception as e:
+            logging.error(f"Error reading file: {e}")
+
+    def display_function(self, function_name):
+        """Displays only the line range of one function, decorators included."""
+        try:
+            tree = self.utils.cache.get_tree(self.file_path)
+        except (OSError, SyntaxError) as e:
+            logging.error(f"Error reading file: {e}")
+            return
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == function_name:
+                start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+                logging.info(f"📜 `{function_name}` (lines {start}-{node.end_lineno}):\n" + "-" * 40)
+                for page in self.iter_pages(start=start, stop=node.end_lineno):
+                    logging.info(page.rstrip("\n"))
+                return
+        logging.error(f"❌ Function '{function_name}' not found.")
+
+    def display_diff(self):
+        """Displays a unified diff of the file against the pre-cycle snapshot."""
+        try:
+            current = self.utils.read_source_code()
         except Exception as e:
             logging.error(f"Error reading file: {e}")
+            return
+        if current is self._snapshot or current == self._snapshot:
+            logging.info("📜 AI source code unchanged this cycle.")
+            return
+        diff = difflib.unified_diff(
+            self._snapshot.splitlines(keepends=True), current.splitlines(keepends=True),
+            fromfile=f"{self.file_path} (before)", tofile=f"{self.file_path} (after)",
+        )
+        logging.info(f"📜 AI source code changes:\n" + "-" * 40)
+        while True:
+            chunk = list(itertools.islice(diff, self.PAGE_SIZE))
+            if not chunk:
+                break
+            logging.info("".join(chunk).rstrip("\n"))
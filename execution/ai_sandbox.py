@@ -1,27 +1,34 @@
 import logging
-import time
+from core_engine.execution.ai_sandbox_pool import AISandboxPool
 
 class AISandbox:
     """Executes AI modifications in an isolated sandbox to prevent instability."""
 
-    def __init__(self):
+    def __init__(self, pool=None):
         """Initialize the sandbox environment with controlled execution."""
-        self.sandbox_globals = {}  # Isolated global execution space
-        self.execution_timeout = 2  # Set a time limit for execution
+        self.pool = pool or AISandboxPool.shared()  # Pre-forked workers, started on first use
+        self.execution_timeout = 2  # Hard wall-clock limit; the worker is killed past it
+
+    def run(self, code_string):
+        """Executes code in a pool worker with fresh globals and returns the full result dict."""
+        return self.pool.submit({"code": code_string}, timeout=self.execution_timeout)
 
     def test_code(self, code_string):
         """Executes the given code in a sandbox environment and checks for errors."""
-        try:
-            start_time = time.time()
-            exec(code_string, self.sandbox_globals)  # Execute code in a safe, isolated space
+        return self._report(self.run(code_string))
 
-            execution_time = time.time() - start_time
-            if execution_time > self.execution_timeout:
-                logging.error("❌ Sandbox execution took too long. Possible infinite loop detected.")
-                return False
+    def test_batch(self, code_strings):
+        """Executes many code strings in parallel across the pool; returns one bool per string."""
+        jobs = [{"code": code_string} for code_string in code_strings]
+        return [self._report(result) for result in self.pool.run_batch(jobs, timeout=self.execution_timeout)]
 
-            logging.info("✅ Sandbox execution successful. Modification passed.")
-            return True
-        except Exception as e:
-            logging.error(f"❌ Sandbox execution failed: {e}")
+    @staticmethod
+    def _report(result):
+        if result["timed_out"]:
+            logging.error("❌ Sandbox execution took too long. Possible infinite loop detected.")
+            return False
+        if not result["ok"]:
+            logging.error(f"❌ Sandbox execution failed: {result['error']}")
             return False
+        logging.info("✅ Sandbox execution successful. Modification passed.")
+        return True
@@ -0,0 +1,233 @@
+import atexit
+import builtins
+import contextlib
+import importlib
+import io
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from multiprocessing.connection import wait
+
+try:
+    import resource
+except ImportError:  # Not available on Windows: jobs still get the wall-clock kill
+    resource = None
+
+
+def _current_address_space():
+    """Returns this process's virtual memory size in bytes (0 if unknown)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def _set_soft_limit(limit, value):
+    """Lowers a soft resource limit without touching the hard ceiling."""
+    soft, hard = resource.getrlimit(limit)
+    if hard != resource.RLIM_INFINITY:
+        value = min(value, hard)
+    resource.setrlimit(limit, (value, hard))
+
+
+def _run_job(job):
+    """Executes one job in fresh globals and returns a picklable result dict."""
+    result = {"ok": False, "error": None, "value": None, "stdout": "", "elapsed": 0.0, "timed_out": False}
+    output = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output):
+            if job.get("target"):
+                module_name, function_name = job["target"].split(":")
+                function = getattr(importlib.import_module(module_name), function_name)
+                result["value"] = function(*job.get("args", ()))
+            else:
+                namespace = {"__name__": "__sandbox__", "__builtins__": builtins}
+                exec(compile(job["code"], "<sandbox>", "exec"), namespace)
+                if job.get("entry"):
+                    result["value"] = namespace[job["entry"]](*job.get("args", ()))
+        result["ok"] = True
+    except BaseException as e:  # Anything the job raises is reported, never propagated
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["elapsed"] = time.perf_counter() - start
+    result["stdout"] = output.getvalue()[-4096:]
+    return result
+
+
+def _worker_main(conn, memory_limit, cpu_limit):
+    """Pre-forked worker loop: receive a job, run it under resource limits, send the result."""
+    if resource is not None and memory_limit:
+        _set_soft_limit(resource.RLIMIT_AS, _current_address_space() + memory_limit)
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if job is None:
+            break
+
+        if resource is not None and cpu_limit:
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            used = math.ceil(usage.ru_utime + usage.ru_stime)
+            _set_soft_limit(resource.RLIMIT_CPU, used + cpu_limit)  # SIGXCPU kills runaway jobs
+
+        result = _run_job(job)
+        try:
+            conn.send(result)
+        except Exception:
+            result["value"] = repr(result["value"])  # Unpicklable return values are sent as text
+            conn.send(result)
+
+
+class AISandboxPool:
+    """
+    Pool of pre-forked worker interpreters that run sandbox jobs in parallel.
+    Each job gets fresh globals, RLIMIT_AS/RLIMIT_CPU limits and a hard wall-clock
+    timeout; a worker that hangs, crashes or exceeds a limit is killed and replaced.
+
+    A job is a dict with either `code` (executed, then `entry(*args)` called if given)
+    or `target` ("module:function", called with `args`).
+    """
+
+    DEFAULT_TIMEOUT = 2.0
+    DEFAULT_MEMORY_LIMIT = 512 * 1024 * 1024  # Extra address space allowed per worker
+    DEFAULT_CPU_LIMIT = 2  # CPU seconds per job
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, workers=None, timeout=DEFAULT_TIMEOUT,
+                 memory_limit=DEFAULT_MEMORY_LIMIT, cpu_limit=DEFAULT_CPU_LIMIT):
+        self.size = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.cpu_limit = cpu_limit
+        methods = multiprocessing.get_all_start_methods()
+        # Workers come from a single-threaded fork server where available: forking the engine
+        # itself while executor threads run (run_async) could copy a held lock, e.g. logging's
+        method = next(method for method in ("forkserver", "fork", "spawn") if method in methods)
+        self._context = multiprocessing.get_context(method)
+        if method == "forkserver":
+            self._context.set_forkserver_preload([__name__])  # Imported once, not per worker
+        self._workers = []  # [process, connection] pairs
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """Returns the process-wide pool, created on first use and shut down at exit."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+                    atexit.register(cls._shared.shutdown)
+        return cls._shared
+
+    def _spawn_worker(self):
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.memory_limit, self.cpu_limit),
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        return [process, parent_conn]
+
+    def start(self):
+        """Forks the workers ahead of time so individual jobs start instantly."""
+        with self._lock:
+            self._start_locked()
+
+    def _start_locked(self):
+        self._workers = [w for w in self._workers if w[0].is_alive()]
+        while len(self._workers) < self.size:
+            self._workers.append(self._spawn_worker())
+
+    def _replace_worker(self, worker):
+        """Kills a misbehaving worker and forks a fresh one in its place."""
+        process, conn = worker
+        if process.is_alive():
+            process.kill()
+        process.join(1)
+        conn.close()
+        worker[:] = self._spawn_worker()
+
+    def submit(self, job, timeout=None):
+        """Runs a single job and returns its result dict."""
+        return self.run_batch([job], timeout=timeout)[0]
+
+    def run_batch(self, jobs, timeout=None):
+        """Runs jobs in parallel across the workers; results keep the input order."""
+        timeout = self.timeout if timeout is None else timeout
+        results = [None] * len(jobs)
+        pending = list(enumerate(jobs))
+        pending.reverse()
+
+        with self._lock:
+            self._start_locked()
+            idle = list(self._workers)
+            busy = {}  # connection -> (worker, job index, deadline)
+
+            while pending or busy:
+                while pending and idle:
+                    index, job = pending.pop()
+                    worker = idle.pop()
+                    try:
+                        worker[1].send(job)
+                    except (BrokenPipeError, OSError):
+                        self._replace_worker(worker)
+                        pending.append((index, job))
+                        idle.append(worker)
+                        continue
+                    busy[worker[1]] = (worker, index, time.monotonic() + timeout)
+
+                next_deadline = min(deadline for _, _, deadline in busy.values())
+                ready = wait(list(busy), timeout=max(0.0, next_deadline - time.monotonic()))
+
+                for conn in ready:
+                    worker, index, _ = busy.pop(conn)
+                    try:
+                        results[index] = conn.recv()
+                    except (EOFError, OSError):
+                        exit_code = worker[0].exitcode
+                        results[index] = self._failure(f"Worker crashed (exit code {exit_code}); "
+                                                       "resource limit exceeded?")
+                        self._replace_worker(worker)
+                    idle.append(worker)
+
+                now = time.monotonic()
+                for conn, (worker, index, deadline) in list(busy.items()):
+                    if now >= deadline:
+                        del busy[conn]
+                        results[index] = self._failure(f"Timed out after {timeout}s", elapsed=timeout, timed_out=True)
+                        self._replace_worker(worker)
+                        idle.append(worker)
+
+        for result in results:
+            if result["timed_out"]:
+                logging.error(f"❌ Sandbox job killed: {result['error']}")
+        return results
+
+    @staticmethod
+    def _failure(error, elapsed=0.0, timed_out=False):
+        return {"ok": False, "error": error, "value": None, "stdout": "", "elapsed": elapsed, "timed_out": timed_out}
+
+    def shutdown(self):
+        """Stops every worker."""
+        with self._lock:
+            for process, conn in self._workers:
+                try:
+                    conn.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+            for process, conn in self._workers:
+                process.join(1)
+                if process.is_alive():
+                    process.kill()
+                conn.close()
+            self._workers = []
@@ -0,0 +1,178 @@
+import ctypes
+import ctypes.util
+import hashlib
+import logging
+import os
+import select
+import struct
+import sys
+import time
+
+
+class _InotifyBackend:
+    """Linux inotify through ctypes. Parent directories are watched so atomic replaces are seen."""
+
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT = struct.Struct("iIII")  # wd, mask, cookie, name length
+    BUFFER_SIZE = 64 * 1024
+
+    def __init__(self, paths):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories = {}  # watch descriptor -> directory
+        for directory in sorted({os.path.dirname(path) for path in paths}):
+            wd = libc.inotify_add_watch(self.fd, directory.encode(), self.MASK)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+            self.directories[wd] = directory
+
+    def read(self, timeout):
+        """Returns the paths touched within `timeout` seconds (None blocks until an event)."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self.fd, self.BUFFER_SIZE)
+        except BlockingIOError:
+            return set()
+
+        touched = set()
+        offset = 0
+        while offset < len(data):
+            wd, _, _, length = self.EVENT.unpack_from(data, offset)
+            offset += self.EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="surrogateescape")
+            offset += length
+            if wd in self.directories and name:
+                touched.add(os.path.join(self.directories[wd], name))
+        return touched
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _PollingBackend:
+    """Portable fallback that compares `(mtime_ns, size)` of every watched file."""
+
+    def __init__(self, paths, interval):
+        self.paths = list(paths)
+        self.interval = interval
+        self._stats = {path: self._stat(path) for path in self.paths}
+
+    @staticmethod
+    def _stat(path):
+        try:
+            stat = os.stat(path)
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def read(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            touched = set()
+            for path in self.paths:
+                stat = self._stat(path)
+                if stat != self._stats[path]:
+                    self._stats[path] = stat
+                    touched.add(path)
+            if touched:
+                return touched
+            if deadline is None:
+                time.sleep(self.interval)
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return touched
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+
+class AIWatcher:
+    """
+    Watches a fixed set of files and reports which ones changed. Bursts of events are
+    debounced, and a file only counts as changed when its content hash differs from
+    the last acknowledged one, so touches and the engine's own writes are ignored
+    once the engine acknowledges them.
+    """
+
+    DEBOUNCE = 0.1
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, paths, debounce=DEBOUNCE, poll_interval=POLL_INTERVAL, use_inotify=True):
+        self.paths = {os.path.abspath(path) for path in paths}
+        self.debounce = debounce
+        self._known = {path: self._hash(path) for path in self.paths}
+        self.backend = None
+        if use_inotify and sys.platform.startswith("linux"):
+            try:
+                self.backend = _InotifyBackend(self.paths)
+                logging.info(f"👀 Watching {len(self.paths)} files with inotify.")
+            except (OSError, AttributeError) as e:
+                logging.warning(f"⚠️ inotify unavailable ({e}); falling back to polling.")
+        if self.backend is None:
+            self.backend = _PollingBackend(self.paths, poll_interval)
+            logging.info(f"👀 Polling {len(self.paths)} files every {poll_interval}s.")
+
+    @staticmethod
+    def _hash(path):
+        try:
+            with open(path, "rb") as file:
+                return hashlib.sha256(file.read()).hexdigest()
+        except FileNotFoundError:
+            return None
+
+    def acknowledge(self, paths=None, digests=None):
+        """
+        Records the current content of `paths` (default: all) as seen, e.g. after the engine
+        wrote them. `digests` maps paths to the content hash the engine itself produced; those
+        are recorded instead, so a later edit by someone else still counts as a change.
+        """
+        digests = {os.path.abspath(path): digest for path, digest in (digests or {}).items()}
+        for path in self.paths if paths is None else list(paths) + list(digests):
+            path = os.path.abspath(path)
+            if path in self.paths:
+                self._known[path] = digests[path] if path in digests else self._hash(path)
+
+    def wait(self, timeout=None):
+        """
+        Blocks until at least one watched file changed content, then waits for the burst
+        to settle for `debounce` seconds. Returns the changed paths (empty on timeout).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            touched = self.backend.read(remaining) & self.paths
+            if not touched:
+                if deadline is not None and time.monotonic() >= deadline:
+                    return set()
+                continue
+
+            while True:  # Debounce: keep collecting until the files stay quiet
+                more = self.backend.read(self.debounce) & self.paths
+                if not more:
+                    break
+                touched |= more
+
+            changed = set()
+            for path in touched:
+                digest = self._hash(path)
+                if digest != self._known.get(path):
+                    self._known[path] = digest
+                    changed.add(path)
+            if changed:
+                return changed
+
+    def close(self):
+        self.backend.close()
@@ -5,13 +5,24 @@ from core_engine.modification.ai_ast_parser import AIASTParser  # Import AST par
 class AIAnalyzer:
     """Analyzes AI's source code for inefficiencies."""
 
-    def __init__(self, file_path):
+    def __init__(self, file_path, ast_parser=None):
         self.file_path = file_path
         self.utils = AIUtils(file_path)
-        self.ast_parser = AIASTParser(file_path)  # Use centralized AST processing
+        self.ast_parser = ast_parser or AIASTParser(file_path)  # Use centralized AST processing
 
-    def analyze_code(self):
-        """Analyzes functions for inefficiencies using AST."""
+    def analyze_code(self, changed_only=False):
+        """
+        Analyzes functions for inefficiencies using AST. With `changed_only=True` only
+        functions whose source changed since the previous analysis are returned.
+        """
         function_details = self.ast_parser.extract_function_definitions()
+        if changed_only:
+            function_details = {name: details for name, details in function_details.items()
+                                if name in self.changed_functions}
         logging.info(f"🔍 Function analysis completed: {function_details}")
         return function_details
+
+    @property
+    def changed_functions(self):
+        """Functions whose fingerprint changed in the last analysis."""
+        return self.ast_parser.changed_functions
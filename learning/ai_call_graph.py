@@ -0,0 +1,253 @@
+import ast
+import logging
+import os
+import textwrap
+from core_engine.learning.ai_fingerprint_index import AIFingerprintIndex
+from core_engine.learning.ai_tracker_store import get_tracker_store
+from core_engine.modification.ai_source_cache import AISourceCache
+
+
+def called_names(nodes, conditional=True):
+    """
+    Names called from `nodes`: `f()` gives `f`, `obj.f()` gives `f`. Nested definitions are
+    skipped. With `conditional=False`, calls that may not run are skipped too: the branches
+    of `a if c else b`, the operands after the first of `and`/`or`, lambdas and comprehensions.
+    """
+    names = set()
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            stack.extend(node.decorator_list)  # Their bodies belong to their own entries
+            continue
+        if not conditional:
+            if isinstance(node, ast.IfExp):
+                stack.append(node.test)
+                continue
+            if isinstance(node, ast.BoolOp):
+                stack.append(node.values[0])
+                continue
+            if isinstance(node, (ast.Lambda, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)):
+                continue
+        if isinstance(node, ast.Call):
+            if isinstance(node.func, ast.Name):
+                names.add(node.func.id)
+            elif isinstance(node.func, ast.Attribute):
+                names.add(node.func.attr)
+        stack.extend(ast.iter_child_nodes(node))
+    return names
+
+
+_BRANCHES = (ast.If, ast.For, ast.AsyncFor, ast.While) + ((ast.Match,) if hasattr(ast, "Match") else ())
+
+
+def _may_exit(statement):
+    """True if `statement` contains a return or raise of its own (nested definitions excluded)."""
+    stack = [statement]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.Return, ast.Raise)):
+            return True
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)):
+            stack.extend(ast.iter_child_nodes(node))
+    return False
+
+
+def unconditional_calls(statements):
+    """
+    Names called on every run of `statements` before it can return: calls behind a branch
+    are skipped, and so is everything after a branch that may return or raise. A function
+    whose own name is in this set for its body recurses without a base case.
+    """
+    names = set()
+    for statement in statements:
+        if isinstance(statement, _BRANCHES):
+            # Only the header runs for sure: the test, or what a loop iterates over
+            header = getattr(statement, "test", None) or getattr(statement, "iter", None) or statement.subject
+            names |= called_names([header], conditional=False)
+        elif isinstance(statement, (ast.With, ast.AsyncWith)):
+            names |= called_names(statement.items, conditional=False) | unconditional_calls(statement.body)
+        elif isinstance(statement, ast.Try):
+            names |= unconditional_calls(statement.body) | unconditional_calls(statement.finalbody)
+        else:
+            names |= called_names([statement], conditional=False)
+        if _may_exit(statement):
+            break
+    return names
+
+
+class AICallGraph:
+    """
+    Persistent static call graph of one module, keyed by function name like the trackers.
+    Edges are re-extracted only for functions whose fingerprint changed; strongly
+    connected components (Tarjan) and the reverse edges are derived on demand.
+    Calls are resolved by name, so a method call `obj.f()` links to every `f` defined.
+    """
+
+    DOCUMENT_KIND = "call_graph"
+    VERSION = 1
+
+    def __init__(self, file_path, store=None):
+        self.file_path = os.path.abspath(file_path)
+        self.store = store or get_tracker_store(file_path)
+        self._document = None
+        self._derived = None  # (edges, callers, sccs) for the current document
+        self._unconsumed = set()  # Changes seen by refresh() but not yet taken by affected_by_changes()
+
+    def _load(self):
+        if self._document is None:
+            document = self.store.load_document(self.DOCUMENT_KIND, self.file_path)
+            if not document or document.get("version") != self.VERSION:
+                document = {"version": self.VERSION, "file_hash": None, "functions": {}}
+            self._document = document
+        return self._document
+
+    def refresh(self):
+        """Brings the graph up to date with the file; returns the names of added, changed or removed functions."""
+        document = self._load()
+        cache = AISourceCache.shared()
+        file_hash = cache.get_hash(self.file_path)
+        if document["file_hash"] == file_hash:
+            return set()
+
+        tree = cache.get_tree(self.file_path)
+        fingerprints = AIFingerprintIndex.fingerprint_functions(cache.get_source(self.file_path), tree)
+        entries = document["functions"]
+        changed = {name for name, fingerprint in fingerprints.items()
+                   if entries.get(name, {}).get("fingerprint") != fingerprint}
+        removed = set(entries) - set(fingerprints)
+
+        callees = {}
+        for node in AIFingerprintIndex.function_nodes(tree):
+            if node.name in changed:  # Same-named definitions merge, like their fingerprints
+                callees.setdefault(node.name, set()).update(called_names(node.body))
+        for name in changed:
+            entries[name] = {"fingerprint": fingerprints[name], "callees": sorted(callees[name])}
+        for name in removed:
+            del entries[name]
+
+        document["file_hash"] = file_hash
+        self.store.save_document(self.DOCUMENT_KIND, self.file_path, document)
+        self._derived = None
+        if changed or removed:
+            logging.info(f"🕸 Call graph updated: {len(changed)} changed, {len(removed)} removed.")
+        self._unconsumed |= changed | removed
+        return changed | removed
+
+    def affected_by_changes(self):
+        """Refreshes the graph and returns the functions affected by every change since the previous call."""
+        self.refresh()
+        changes, self._unconsumed = self._unconsumed, set()
+        return self.affected(changes)
+
+    def _graph(self):
+        """Returns `(edges, callers, sccs)` restricted to functions defined in the module."""
+        if self._derived is None:
+            entries = self._load()["functions"]
+            edges = {name: [callee for callee in entry["callees"] if callee in entries]
+                     for name, entry in entries.items()}
+            callers = {name: set() for name in edges}
+            for name, targets in edges.items():
+                for callee in targets:
+                    callers[callee].add(name)
+            self._derived = (edges, callers, self._tarjan(edges))
+        return self._derived
+
+    @staticmethod
+    def _tarjan(edges):
+        """Iterative Tarjan: returns the strongly connected components as frozensets."""
+        index, lowlink, on_stack = {}, {}, set()
+        stack, components, counter = [], [], 0
+        for root in edges:
+            if root in index:
+                continue
+            work = [(root, iter(edges[root]))]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child not in index:
+                        index[child] = lowlink[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(edges[child])))
+                        break
+                    if child in on_stack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = set()
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.add(member)
+                            if member == node:
+                                break
+                        components.append(frozenset(component))
+        return components
+
+    def callees(self, function_name):
+        return set(self._graph()[0].get(function_name, ()))
+
+    def callers(self, function_name):
+        return set(self._graph()[1].get(function_name, ()))
+
+    def components(self):
+        """Strongly connected components of the module's functions."""
+        return list(self._graph()[2])
+
+    def cycles(self):
+        """Components that recurse: mutual recursion groups and self-recursive functions."""
+        edges = self._graph()[0]
+        return [component for component in self._graph()[2]
+                if len(component) > 1 or next(iter(component)) in edges[next(iter(component))]]
+
+    def affected(self, function_names):
+        """The given functions plus every function that can reach them through calls."""
+        callers = self._graph()[1]
+        affected = set(function_names)
+        pending = [name for name in affected if name in callers]
+        while pending:
+            for caller in callers[pending.pop()]:
+                if caller not in affected:
+                    affected.add(caller)
+                    pending.append(caller)
+        return affected
+
+    def introduces_cycle(self, function_name, new_code, allow_guarded_self=False):
+        """
+        True if giving `function_name` the body `new_code` would let it reach itself through
+        calls. With `allow_guarded_self=True` a direct self-call behind a base case (a branch
+        that may return first) is accepted; one reached on every run still counts.
+        """
+        try:
+            body = ast.parse(textwrap.dedent(new_code)).body
+        except SyntaxError:
+            return False  # Rejected later by the modifier's own syntax check
+        new_callees = called_names(body)
+        edges = self._graph()[0]
+        seen = set()
+        if allow_guarded_self and function_name not in unconditional_calls(body):
+            new_callees.discard(function_name)
+        pending = [callee for callee in new_callees if callee == function_name or callee in edges]
+        while pending:
+            name = pending.pop()
+            if name == function_name:
+                return True
+            if name not in seen:
+                seen.add(name)
+                pending.extend(edges.get(name, ()))
+        return False
+
+    def reload(self):
+        """Forgets the loaded graph so the next lookup re-reads it from the store."""
+        self._document = None
+        self._derived = None
@@ -0,0 +1,31 @@
+class AICostModel:
+    """
+    Ranks functions by the expected payoff of optimizing them, using the metrics
+    reports of `AIFunctionMetrics`. Work inside loops dominates: each call or
+    attribute lookup in a loop is weighted, and every extra nesting level multiplies
+    the estimate. Functions without loops have nothing to gain and score zero.
+    """
+
+    CALL_WEIGHT = 3.0
+    ATTRIBUTE_WEIGHT = 1.0
+    STATEMENT_WEIGHT = 0.5
+    COMPLEXITY_WEIGHT = 0.25
+    NESTING_FACTOR = 4.0  # Assumed iterations per extra level of loop nesting
+
+    def score(self, report):
+        """Expected payoff of optimizing one function; 0 when there is nothing to gain."""
+        depth = report.get("max_loop_depth", 1 if report.get("contains_loops") else 0)
+        if not depth:
+            return 0.0
+        loop_work = (1.0
+                     + self.CALL_WEIGHT * report.get("calls_in_loops", 0)
+                     + self.ATTRIBUTE_WEIGHT * report.get("attribute_lookups_in_loops", 0)
+                     + self.STATEMENT_WEIGHT * report.get("num_statements", 0))
+        return (loop_work * self.NESTING_FACTOR ** (depth - 1)
+                + self.COMPLEXITY_WEIGHT * report.get("cyclomatic_complexity", 1))
+
+    def rank(self, function_reports, budget=None):
+        """Returns function names ordered by payoff, dropping zero scores and cutting at `budget`."""
+        scored = [(self.score(report), name) for name, report in function_reports.items()]
+        ranked = [name for score, name in sorted(scored, key=lambda item: (-item[0], item[1])) if score > 0]
+        return ranked if budget is None else ranked[:budget]
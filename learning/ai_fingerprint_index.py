@@ -0,0 +1,86 @@
+import ast
+import hashlib
+import io
+import logging
+import os
+from core_engine.learning.ai_tracker_store import get_tracker_store
+
+
+class AIFingerprintIndex:
+    """
+    Persistent per-function fingerprint index. Each function is fingerprinted by
+    hashing its own source segment (decorators through `end_lineno`), so a cycle
+    only has to re-analyze the functions whose text actually changed.
+    """
+
+    DOCUMENT_KIND = "function_fingerprints"
+    VERSION = 3  # Bump whenever the cached report format changes
+
+    def __init__(self, file_path, store=None):
+        self.file_path = os.path.abspath(file_path)
+        self.store = store or get_tracker_store(file_path)
+        self._document = None
+
+    @staticmethod
+    def function_nodes(tree):
+        """Yields every function definition in the tree, nested ones included."""
+        for node in ast.walk(tree):
+            if isinstance(node, ast.FunctionDef):
+                yield node
+
+    @classmethod
+    def fingerprint_functions(cls, source_code, tree):
+        """Maps each function name to a digest of its source segment(s)."""
+        lines = io.StringIO(source_code, newline="").readlines()  # Line ends as ast counts them
+        hashers = {}
+        for node in cls.function_nodes(tree):
+            start = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+            segment = "".join(lines[start - 1:node.end_lineno])
+            hasher = hashers.setdefault(node.name, hashlib.blake2b(digest_size=16))
+            hasher.update(segment.encode("utf-8"))  # Same-named methods fold into one fingerprint
+        return {name: hasher.hexdigest() for name, hasher in hashers.items()}
+
+    def _load(self):
+        if self._document is None:
+            document = self.store.load_document(self.DOCUMENT_KIND, self.file_path)
+            if not document or document.get("version") != self.VERSION:
+                document = {"version": self.VERSION, "file_hash": None, "functions": {}}
+            self._document = document
+        return self._document
+
+    def changed_functions(self, source_code, tree, file_hash):
+        """
+        Returns `(fingerprints, changed)` for the current file version. When the whole
+        file hash matches the last indexed version no segment is re-hashed at all.
+        """
+        document = self._load()
+        entries = document["functions"]
+        if document["file_hash"] == file_hash:
+            return {name: entry["fingerprint"] for name, entry in entries.items()}, set()
+
+        fingerprints = self.fingerprint_functions(source_code, tree)
+        changed = {name for name, fingerprint in fingerprints.items()
+                   if entries.get(name, {}).get("fingerprint") != fingerprint}
+        logging.info(f"🧬 {len(changed)}/{len(fingerprints)} functions changed since the last cycle.")
+        return fingerprints, changed
+
+    def cached_report(self, function_name):
+        """Returns the stored analysis report of an unchanged function, or None."""
+        entry = self._load()["functions"].get(function_name)
+        return entry["report"] if entry else None
+
+    def update(self, file_hash, fingerprints, reports):
+        """Persists the fingerprints and reports of the current file version."""
+        document = self._load()
+        if document["file_hash"] == file_hash:
+            return
+        document["file_hash"] = file_hash
+        document["functions"] = {
+            name: {"fingerprint": fingerprint, "report": reports.get(name)}
+            for name, fingerprint in fingerprints.items()
+        }
+        self.store.save_document(self.DOCUMENT_KIND, self.file_path, document)
+
+    def reload(self):
+        """Forgets the loaded index so the next lookup re-reads it from the store."""
+        self._document = None
@@ -1,49 +1,83 @@
 import ast
 import logging
 from core_engine.modification.ai_modifier import AIModifier
+from core_engine.modification.ai_source_cache import AISourceCache
 from core_engine.learning.ai_fractal_tracker import AIFractalTracker
 from core_engine.learning.ai_function_tracker import AIFunctionTracker
+from core_engine.learning.ai_call_graph import AICallGraph
 
 class AIFPL:
     """Implements Fractal Propagation Learning (FPL) for AI self-expansion."""
+    MAX_CALL_DEPTH = 5  # Base case of every expanded body: nested self-calls stop here
 
-    def __init__(self, file_path):
+    def __init__(self, file_path, modifier=None, fractal_tracker=None, function_tracker=None, call_graph=None):
         self.file_path = file_path
-        self.modifier = AIModifier(file_path)
-        self.fractal_tracker = AIFractalTracker(file_path)
-        self.function_tracker = AIFunctionTracker(file_path)
+        self.modifier = modifier or AIModifier(file_path)
+        self.fractal_tracker = fractal_tracker or AIFractalTracker(file_path)
+        self.function_tracker = function_tracker or AIFunctionTracker(file_path)
+        self.call_graph = call_graph or AICallGraph(file_path)  # Static recursion check before any write
 
     def analyze_and_expand(self):
         """Analyzes AI's functions and applies fractal expansion logic."""
-        with open(self.file_path, "r", encoding="utf-8") as file:
-            source_code = file.read()
-
-        tree = ast.parse(source_code)
+        tree = AISourceCache.shared().get_tree(self.file_path)
         function_names = [node.name for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
 
         logging.info(f"🔍 Identified {len(function_names)} functions for recursive expansion.")
 
+        edits = {}
         for function_name in function_names:
             if function_name not in {"__init__", "run"} and self.fractal_tracker.can_expand(function_name):
-                self.expand_function(function_name)
+                fractal_code = self.build_expansion(function_name)
+                if fractal_code:
+                    edits[function_name] = fractal_code
 
-    def expand_function(self, function_name):
-        """Applies recursive modifications to a function, ensuring controlled recursion."""
+        self.apply_expansions(edits)
+
+    def build_expansion(self, function_name):
+        """Builds the recursive body for a function, or None if it would be redundant."""
         fractal_code = (
             f"    print('🔄 Expanding function: {function_name}')\n"
-            f"    return {function_name}()\n"
+            f"    depth = getattr({function_name}, 'fractal_depth', 0)\n"
+            f"    if depth >= {self.MAX_CALL_DEPTH}:\n"
+            f"        return None\n"
+            f"    {function_name}.fractal_depth = depth + 1\n"
+            f"    try:\n"
+            f"        return {function_name}()\n"
+            f"    finally:\n"
+            f"        {function_name}.fractal_depth = depth\n"
         )
 
         if not self.function_tracker.has_changed(function_name, fractal_code):
             logging.info(f"🔄 Skipping redundant modification for '{function_name}', no significant change detected.")
-            return
+            return None
+
+        # The self-call is the expansion itself and stops at MAX_CALL_DEPTH nested calls.
+        # Self-recursion without such a base case, or through other functions, is rejected.
+        self.call_graph.refresh()
+        if self.call_graph.introduces_cycle(function_name, fractal_code, allow_guarded_self=True):
+            logging.warning(f"⚠️ Rejected expansion of '{function_name}': it would introduce a recursion cycle.")
+            return None
 
         logging.info(f"🔄 Applying fractal learning expansion to '{function_name}'.")
-        success = self.modifier.modify_function(function_name, fractal_code)
-
-        if success:
-            self.fractal_tracker.log_expansion(function_name)
-            self.function_tracker.log_modification(function_name, fractal_code)
-            logging.info(f"✅ Successfully expanded '{function_name}'.")
-        else:
-            logging.error(f"❌ Expansion failed for '{function_name}'.")
+        return fractal_code
+
+    def apply_expansions(self, edits):
+        """Writes all pending expansions in one batch and records the successful ones."""
+        if not edits:
+            return {}
+
+        results = self.modifier.modify_functions(edits)
+        for function_name, success in results.items():
+            if success:
+                self.fractal_tracker.log_expansion(function_name)
+                self.function_tracker.log_modification(function_name, edits[function_name])
+                logging.info(f"✅ Successfully expanded '{function_name}'.")
+            else:
+                logging.error(f"❌ Expansion failed for '{function_name}'.")
+        return results
+
+    def expand_function(self, function_name):
+        """Applies recursive modifications to a function, ensuring controlled recursion."""
+        fractal_code = self.build_expansion(function_name)
+        if fractal_code:
+            self.apply_expansions({function_name: fractal_code})
@@ -1,44 +1,35 @@
 import json
 import hashlib
 import logging
+from core_engine.learning.ai_tracker_store import get_tracker_store, record_prefix
+from core_engine.learning.ai_tracker_state import get_tracker_state
 
 class AIFunctionTracker:
     """Tracks function modifications across iterations."""
 
-    def __init__(self, file_path):
+    def __init__(self, file_path, store=None):
         self.file_path = file_path
-        self.log_file = "function_modifications.json"
-        self.data = self._load_log()
+        self.store = store or get_tracker_store(file_path)  # Shared per target directory
+        self.state = get_tracker_state(self.store)  # Compact in-memory mirror, shared with the fractal tracker
+        self.prefix = record_prefix(self.store, file_path)  # Records are per module, not per bare name
 
-    def _load_log(self):
-        """Load existing function modification logs."""
-        try:
-            with open(self.log_file, "r") as file:
-                return json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            logging.warning("⚠️ Corrupt JSON file detected. Resetting log...")
-            return {}
+    @staticmethod
+    def _hash(function_code):
+        """Hashes function code to a 32-byte digest; dict reports are serialized deterministically first."""
+        function_code_str = json.dumps(function_code, sort_keys=True)
+        return hashlib.sha256(function_code_str.encode()).digest()
 
     def has_changed(self, function_name, function_code):
-        """Check if the function has been modified since last iteration."""
-        if function_name not in self.data:
-            return True  # New function
-
-        # ✅ FIX: Convert dict function_code into a string before hashing
-        function_code_str = json.dumps(function_code, sort_keys=True)
+        """Check if the function has been modified since last iteration (new functions count as changed)."""
+        return not self.state.matches(self.prefix + function_name, self._hash(function_code))
 
-        function_hash = hashlib.sha256(function_code_str.encode()).hexdigest()
-        return self.data[function_name]["last_hash"] != function_hash
+    def get_record(self, function_name):
+        """Returns the AIFunctionRecord view of a function, or None."""
+        return self.state.get(self.prefix + function_name)
 
     def log_modification(self, function_name, function_code):
         """Logs function modifications."""
-        function_code_str = json.dumps(function_code, sort_keys=True)
-        function_hash = hashlib.sha256(function_code_str.encode()).hexdigest()
-
-        self.data[function_name] = {
-            "modification_count": self.data.get(function_name, {}).get("modification_count", 0) + 1,
-            "last_hash": function_hash
-        }
-
-        with open(self.log_file, "w") as file:
-            json.dump(self.data, file, indent=4)
+        digest = self._hash(function_code)
+        self.store.record_modification(self.prefix + function_name, digest.hex())
+        count = self.state.record_modification(self.prefix + function_name, digest)
+        logging.debug(f"📝 Function '{function_name}' modification #{count} logged.")
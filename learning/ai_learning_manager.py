@@ -1,3 +1,5 @@
+import asyncio
+import functools
 import logging
 from core_engine.learning.ai_fpl import AIFPL
 from core_engine.learning.ai_fractal_tracker import AIFractalTracker
@@ -10,23 +12,65 @@ from core_engine.modification.ai_code_expander import AICodeExpander  # ✅ NEW:
 class AILearningManager:
     """Handles AI fractal learning, function tracking, and optimization."""
 
-    def __init__(self, file_path):
+    def __init__(self, file_path, fpl=None, fractal_tracker=None, function_tracker=None,
+                 analyzer=None, optimizer=None, modifier=None, code_expander=None):
+        """Collaborators may be injected so an engine shares one instance of each."""
         self.file_path = file_path
-        self.fpl = AIFPL(file_path)  # Fractal Propagation Learning
-        self.fractal_tracker = AIFractalTracker(file_path)  # Tracks recursive learning layers
-        self.function_tracker = AIFunctionTracker(file_path)  # Tracks function modifications across iterations
-        self.analyzer = AIAnalyzer(file_path)
-        self.optimizer = AIOPTimizer(file_path)
-        self.modifier = AIModifier(file_path)
-        self.code_expander = AICodeExpander(file_path)  # ✅ NEW: AI Function Expansion
+        self.modifier = modifier or AIModifier(file_path)
+        self.fractal_tracker = fractal_tracker or AIFractalTracker(file_path)  # Tracks recursive learning layers
+        self.function_tracker = function_tracker or AIFunctionTracker(file_path)  # Tracks function modifications across iterations
+        self.fpl = fpl or AIFPL(file_path, self.modifier, self.fractal_tracker, self.function_tracker)  # Fractal Propagation Learning
+        self.analyzer = analyzer or AIAnalyzer(file_path, self.modifier.ast_parser)
+        self.optimizer = optimizer or AIOPTimizer(file_path, self.modifier)
+        self.code_expander = code_expander or AICodeExpander(file_path, function_tracker=self.function_tracker)  # ✅ NEW: AI Function Expansion
 
     def run_learning_cycle(self):
         """Executes AI fractal learning, tracks function evolution, and dynamically expands AI functions."""
-        logging.info("🚀 Running AI Fractal Learning Expansion...")
-        self.fpl.analyze_and_expand()
+        with self.function_tracker.store.batch():  # One tracker transaction per cycle
+            logging.info("🚀 Running AI Fractal Learning Expansion...")
+            self.fpl.analyze_and_expand()
 
-        function_report = self.analyzer.analyze_code()
+            function_report = self.analyzer.analyze_code(changed_only=True)  # Unchanged functions are skipped
+            self._track_functions(function_report)
 
+            # ✅ NEW: Generate new AI functions dynamically
+            self._log_expansion(self.code_expander.expand_code())
+
+            logging.info("🔍 Analyzing AI source code for inefficiencies...")
+            self.optimizer.optimize_functions(function_report)
+
+        logging.info("✅ AI Learning Cycle Completed.")
+
+    async def run_learning_cycle_async(self, executor=None):
+        """
+        Async variant of `run_learning_cycle`. Blocking steps run in `executor` (the loop's
+        default when None). Once the analysis is done, two chains overlap: tracker logging
+        followed by function generation, which both write the function-tracker store, and
+        optimization, which only writes the source file and its snapshot store.
+        """
+        loop = asyncio.get_running_loop()
+        batch = self.function_tracker.store.batch()
+        await loop.run_in_executor(executor, batch.__enter__)
+        try:
+            logging.info("🚀 Running AI Fractal Learning Expansion...")
+            await loop.run_in_executor(executor, self.fpl.analyze_and_expand)
+
+            function_report = await loop.run_in_executor(
+                executor, functools.partial(self.analyzer.analyze_code, changed_only=True))
+
+            logging.info("🔍 Analyzing AI source code for inefficiencies...")
+            new_functions, _ = await asyncio.gather(
+                loop.run_in_executor(executor, self._track_and_expand, function_report),
+                loop.run_in_executor(executor, self.optimizer.optimize_functions, function_report),
+            )
+            self._log_expansion(new_functions)
+        finally:
+            await loop.run_in_executor(executor, batch.__exit__, None, None, None)  # Flush off the event loop
+
+        logging.info("✅ AI Learning Cycle Completed.")
+
+    def _track_functions(self, function_report):
+        """Logs fractal expansions and modifications of the analyzed functions."""
         for function_name, function_code in function_report.items():
             # ✅ NEW: Expand AI-generated functions dynamically
             if self.fractal_tracker.can_expand(function_name):
@@ -39,12 +83,12 @@ class AILearningManager:
             else:
                 logging.info(f"🔄 Skipping redundant modification for '{function_name}', no significant change detected.")
 
-        # ✅ NEW: Generate new AI functions dynamically
-        new_functions = self.code_expander.expand_code()
+    def _track_and_expand(self, function_report):
+        """Tracker logging, then function generation: one after the other, as both write the tracker store."""
+        self._track_functions(function_report)
+        return self.code_expander.expand_code()
+
+    @staticmethod
+    def _log_expansion(new_functions):
         if new_functions:
             logging.info(f"✅ AI successfully expanded {len(new_functions)} new functions.")
-
-        logging.info("🔍 Analyzing AI source code for inefficiencies...")
-        self.optimizer.optimize_functions(function_report)
-
-        logging.info("✅ AI Learning Cycle Completed.")
@@ -1,28 +1,66 @@
 import logging
 from core_engine.modification.ai_modifier import AIModifier
+from core_engine.learning.ai_cost_model import AICostModel
 
 class AIOPTimizer:
     """Forces AI functions to be modified without mercy."""
 
-    def __init__(self, file_path):
+    CYCLE_BUDGET = 5  # Functions rewritten per cycle, most expensive first
+    DOCUMENT_KIND = "optimizer_deferred"  # Candidates the budget cut, re-ranked next cycle
+
+    def __init__(self, file_path, modifier=None, cost_model=None, budget=None):
         """Initialize the AI Optimizer with the file path."""
         self.file_path = file_path
-        self.modifier = AIModifier(file_path)
+        self.modifier = modifier or AIModifier(file_path)
+        self.cost_model = cost_model or AICostModel()
+        self.budget = self.CYCLE_BUDGET if budget is None else budget
+        self.fingerprints = self.modifier.ast_parser.fingerprints  # Current reports of deferred functions
+
+    def _deferred_reports(self):
+        """Current reports of the candidates earlier cycles deferred; removed functions drop out."""
+        names = self.fingerprints.store.load_document(self.DOCUMENT_KIND, self.fingerprints.file_path) or []
+        reports = {}
+        for func in names:
+            report = self.fingerprints.cached_report(func)
+            if report is not None:
+                reports[func] = report
+        return names, reports
+
+    def _save_deferred(self, previous, deferred):
+        if deferred != previous:
+            self.fingerprints.store.save_document(self.DOCUMENT_KIND, self.fingerprints.file_path, deferred)
 
     def optimize_functions(self, function_reports):
-        """Aggressively rewrites AI functions that are inefficient."""
+        """
+        Aggressively rewrites AI functions that are inefficient. Candidates cut by the
+        budget are persisted and ranked again next cycle, even if their source is unchanged.
+        """
         protected_functions = {"run", "__init__"}  # **Don't touch these**
 
-        for func, details in function_reports.items():
+        previous, deferred_reports = self._deferred_reports()
+        eligible = {}
+        for func, details in {**deferred_reports, **function_reports}.items():  # Fresh reports win
             if func in protected_functions:
                 continue  # **Don't modify protected functions**
 
             if details.get('contains_loops', False) and not details.get('contains_conditionals', False):
-                logging.info(f"⚒️ REWRITING '{func}': Loop detected, must be optimized.")
+                eligible[func] = details
+
+        ranked = self.cost_model.rank(eligible)  # **Most expensive first**
+        candidates, deferred = ranked[:self.budget], ranked[self.budget:]
+        self._save_deferred(previous, deferred)
+        if not candidates:
+            return
+        for func in candidates:
+            logging.info(f"⚒️ REWRITING '{func}': Loop detected, must be optimized "
+                         f"(cost {self.cost_model.score(eligible[func]):.1f}).")
+        if deferred:
+            logging.info(f"⏳ {len(deferred)} candidates deferred to later cycles.")
 
-                success = self.modifier.modify_function(func)  # **Force Rewrite**
+        results = self.modifier.modify_functions({func: None for func in candidates})  # **Force Rewrite**, one write
 
-                if success:
-                    logging.info(f"✅ Function '{func}' has been successfully rewritten.")
-                else:
-                    logging.error(f"❌ Failed to modify '{func}'.")
+        for func, success in results.items():
+            if success:
+                logging.info(f"✅ Function '{func}' has been successfully rewritten.")
+            else:
+                logging.error(f"❌ Failed to modify '{func}'.")
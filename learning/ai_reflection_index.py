@@ -0,0 +1,91 @@
+import ast
+import io
+import logging
+import os
+import threading
+from collections import namedtuple
+from core_engine.modification.ai_source_cache import AISourceCache
+
+AIFunctionEntry = namedtuple("AIFunctionEntry", "name qualname args docstring start end")
+
+
+class AIReflectionIndex:
+    """
+    Function metadata of one module built from a single parse: name, qualified name,
+    argument names, docstring and source span, plus a line-offset table that turns a
+    span into its source with one slice. The index rebuilds only when the file's
+    content hash changes, so looking up many functions costs one pass over the file.
+    """
+
+    _indexes = {}
+    _indexes_lock = threading.Lock()
+
+    def __init__(self, file_path):
+        self.file_path = os.path.abspath(file_path)
+        self._lock = threading.RLock()
+        self._hash = None
+        self._source = ""
+        self._offsets = [0]  # line number - 1 -> offset of the line's first character
+        self._by_line = {}  # first line (decorators included) -> entry, matches co_firstlineno
+
+    @classmethod
+    def for_file(cls, file_path):
+        """Returns the index shared by every reflector looking at `file_path`."""
+        file_path = os.path.abspath(file_path)
+        with cls._indexes_lock:
+            index = cls._indexes.get(file_path)
+            if index is None:
+                index = cls._indexes[file_path] = cls(file_path)
+            return index
+
+    def refresh(self):
+        """Rebuilds the index if the file changed since the last build."""
+        cache = AISourceCache.shared()
+        with self._lock:
+            file_hash = cache.get_hash(self.file_path)
+            if file_hash == self._hash:
+                return
+            source = cache.get_source(self.file_path)
+            self._build(source, cache.get_tree(self.file_path))
+            self._hash = file_hash
+        logging.debug(f"🗂 Reflection index built for {self.file_path}: {len(self._by_line)} functions.")
+
+    def _build(self, source, tree):
+        offsets = [0]
+        # Only \n, \r\n and \r end a line for ast; str.splitlines() also splits on \x0c, \u2028...
+        for line in io.StringIO(source, newline="").readlines():
+            offsets.append(offsets[-1] + len(line))
+        by_line = {}
+
+        stack = [(node, "") for node in reversed(tree.body)]
+        while stack:
+            node, prefix = stack.pop()
+            if isinstance(node, ast.ClassDef):
+                stack.extend((child, f"{prefix}{node.name}.") for child in reversed(node.body))
+                continue
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            arguments = node.args
+            args = [arg.arg for arg in arguments.posonlyargs + arguments.args]
+            if arguments.vararg:
+                args.append(arguments.vararg.arg)
+            args.extend(arg.arg for arg in arguments.kwonlyargs)
+            if arguments.kwarg:
+                args.append(arguments.kwarg.arg)
+            start = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+            entry = AIFunctionEntry(node.name, prefix + node.name, args, ast.get_docstring(node),
+                                    start, node.end_lineno)
+            by_line[start] = entry
+            stack.extend((child, f"{entry.qualname}.<locals>.") for child in reversed(node.body))
+
+        self._source, self._offsets, self._by_line = source, offsets, by_line
+
+    def at_line(self, lineno):
+        """Entry of the function whose definition starts at `lineno`, or None."""
+        self.refresh()
+        return self._by_line.get(lineno)
+
+    def source(self, entry):
+        """Source text of an entry's span, decorators and first-line indentation included."""
+        with self._lock:
+            return self._source[self._offsets[entry.start - 1]:self._offsets[entry.end]]
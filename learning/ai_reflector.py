@@ -1,27 +1,58 @@
 import inspect
 import logging
+import os
+from core_engine.execution.ai_sandbox import AISandbox
+from core_engine.learning.ai_reflection_index import AIReflectionIndex
 
 class AIReflector:
     """Handles AI self-reflection using the inspect module and dynamic execution."""
 
-    def __init__(self, target_object):
+    def __init__(self, target_object, sandbox=None):
         """Initialize with the AI instance or module."""
         self.target_object = target_object
+        self.sandbox = sandbox
 
-    def get_function_info(self, function_name):
-        """Retrieves metadata about a given function in the AI."""
-        try:
-            func = getattr(self.target_object, function_name, None)
-            if not func or not inspect.isfunction(func):
-                logging.error(f"❌ Function '{function_name}' not found.")
-                return None
+    def _resolve(self, function_name):
+        """Returns the plain function named `function_name` on the target, or None."""
+        func = getattr(self.target_object, function_name, None)
+        if inspect.ismethod(func):  # Bound to an instance or class target
+            func = func.__func__
+        if not func or not inspect.isfunction(func):
+            logging.error(f"❌ Function '{function_name}' not found.")
+            return None
+        return func
 
-            func_info = {
+    @staticmethod
+    def _describe(function_name, func):
+        """Builds the info dict from the cached reflection index of the function's file."""
+        code = func.__code__
+        entry = None
+        if os.path.exists(code.co_filename):
+            index = AIReflectionIndex.for_file(code.co_filename)
+            entry = index.at_line(code.co_firstlineno)
+        if entry is None or entry.qualname != func.__qualname__:
+            # Defined outside a readable file (exec, lambdas, a stale module): ask inspect
+            return {
                 "name": function_name,
                 "args": list(inspect.signature(func).parameters.keys()),
                 "docstring": inspect.getdoc(func),
                 "source": inspect.getsource(func)
             }
+        return {
+            "name": function_name,
+            "args": list(entry.args),
+            "docstring": entry.docstring if entry.docstring is not None else inspect.getdoc(func),
+            "source": index.source(entry)
+        }
+
+    def get_function_info(self, function_name):
+        """Retrieves metadata about a given function in the AI."""
+        try:
+            func = self._resolve(function_name)
+            if func is None:
+                return None
+
+            func_info = self._describe(function_name, func)
             logging.info(f"🔍 Retrieved function info: {func_info}")
             return func_info
 
@@ -29,8 +60,37 @@ class AIReflector:
             logging.error(f"❌ Error retrieving function info: {e}")
             return None
 
-    def execute_code(self, code_string, local_vars=None):
-        """Executes a dynamically generated code snippet safely."""
+    def get_functions_info(self, function_names=None):
+        """
+        Retrieves metadata for many functions in one pass (default: every function of a
+        module target, or every method of a class or instance target, inherited ones
+        included). Returns a dict keyed by name; unknown names are left out.
+        """
+        if function_names is None:
+            owner = self.target_object
+            if not (inspect.ismodule(owner) or inspect.isclass(owner)):
+                owner = type(owner)  # Listing the class never evaluates the instance's properties
+            function_names = [name for name, _ in inspect.getmembers(owner, inspect.isfunction)]
+        functions_info = {}
+        for function_name in function_names:
+            try:
+                func = self._resolve(function_name)
+                if func is not None:
+                    functions_info[function_name] = self._describe(function_name, func)
+            except Exception as e:
+                logging.error(f"❌ Error retrieving function info for '{function_name}': {e}")
+        logging.info(f"🔍 Retrieved info for {len(functions_info)} functions.")
+        return functions_info
+
+    def execute_code(self, code_string, local_vars=None, isolated=False):
+        """
+        Executes a dynamically generated code snippet safely. With `isolated=True` the
+        snippet runs in a sandbox worker process instead (`local_vars` is not populated).
+        """
+        if isolated:
+            if self.sandbox is None:
+                self.sandbox = AISandbox()
+            return self.sandbox.test_code(code_string)
         try:
             exec(code_string, {}, local_vars if local_vars else {})
             logging.info("✅ Executed code successfully.")
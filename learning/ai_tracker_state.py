@@ -0,0 +1,156 @@
+import logging
+import sys
+import threading
+from array import array
+
+
+class AIFunctionRecord:
+    """Read-only view of one function's tracker state; holds no data of its own."""
+
+    __slots__ = ("_state", "_id")
+
+    def __init__(self, state, function_id):
+        self._state = state
+        self._id = function_id
+
+    @property
+    def name(self):
+        return self._state.names[self._id]
+
+    @property
+    def modification_count(self):
+        return self._state.counts[self._id]
+
+    @property
+    def last_hash(self):
+        """Hex digest of the last logged version, or None if none was logged."""
+        digest = self._state.digest(self._id)
+        return digest.hex() if digest is not None else None
+
+    @property
+    def expansion_depth(self):
+        return self._state.depths[self._id]
+
+    def __repr__(self):
+        return (f"AIFunctionRecord({self.name!r}, modification_count={self.modification_count}, "
+                f"expansion_depth={self.expansion_depth})")
+
+
+class AITrackerState:
+    """
+    Compact in-memory tracker state shared by the function and fractal trackers of one
+    store. Each name is interned once and mapped to an integer id; per-id data lives in
+    parallel arrays: 32-byte digests back to back in one bytearray, modification counts
+    and expansion depths in `array('I')`. Every lookup is one dict probe plus an index,
+    after a cheap `store.version()` check that reloads the state when another process
+    (a project worker, the daemon) wrote the store. The store remains the durable copy;
+    this state mirrors it write-through.
+    """
+
+    DIGEST_SIZE = 32
+    _EMPTY_DIGEST = bytes(DIGEST_SIZE)
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.RLock()
+        self.reload()
+
+    def reload(self):
+        """Rebuilds the state from the store, e.g. after another process changed it."""
+        with self._lock:
+            self._version = self.store.version()  # Taken first so a write racing the rebuild is seen later
+            self.ids = {}  # interned name -> id
+            self.names = []  # id -> name
+            self.digests = bytearray()  # id * DIGEST_SIZE -> digest (all zeros: none logged)
+            self.counts = array("I")
+            self.depths = array("I")
+            for function_name, count, last_hash in self.store.iter_functions():
+                function_id = self._id_for(function_name)
+                self.counts[function_id] = count
+                if last_hash:
+                    self._set_digest(function_id, bytes.fromhex(last_hash))
+            for function_name, depth in self.store.iter_expansions():
+                self.depths[self._id_for(function_name)] = depth
+        logging.debug(f"🗜 Tracker state loaded: {len(self.names)} functions in {self.nbytes()} bytes of arrays.")
+
+    def _sync(self):
+        """Reloads the store and this state if another process changed the store."""
+        if self.store.version() != self._version:
+            with self._lock:
+                if self.store.version() != self._version:
+                    self.store.reload()
+                    self.reload()
+
+    def _id_for(self, function_name):
+        function_id = self.ids.get(function_name)
+        if function_id is None:
+            function_name = sys.intern(function_name)
+            function_id = self.ids[function_name] = len(self.names)
+            self.names.append(function_name)
+            self.digests += self._EMPTY_DIGEST
+            self.counts.append(0)
+            self.depths.append(0)
+        return function_id
+
+    def _set_digest(self, function_id, digest):
+        offset = function_id * self.DIGEST_SIZE
+        self.digests[offset:offset + self.DIGEST_SIZE] = digest
+
+    def digest(self, function_id):
+        """Returns the raw digest of an id, or None if no version was logged."""
+        offset = function_id * self.DIGEST_SIZE
+        digest = bytes(self.digests[offset:offset + self.DIGEST_SIZE])
+        return None if digest == self._EMPTY_DIGEST else digest
+
+    def get(self, function_name):
+        """Returns an AIFunctionRecord view, or None for an unknown function."""
+        self._sync()
+        function_id = self.ids.get(function_name)
+        return None if function_id is None else AIFunctionRecord(self, function_id)
+
+    def matches(self, function_name, digest):
+        """True if `digest` equals the last logged digest of the function."""
+        self._sync()
+        function_id = self.ids.get(function_name)
+        if function_id is None:
+            return False
+        offset = function_id * self.DIGEST_SIZE
+        return self.digests[offset:offset + self.DIGEST_SIZE] == digest
+
+    def expansion_depth(self, function_name):
+        self._sync()
+        function_id = self.ids.get(function_name)
+        return 0 if function_id is None else self.depths[function_id]
+
+    def record_modification(self, function_name, digest):
+        """Mirrors a logged modification and returns the new count."""
+        with self._lock:
+            function_id = self._id_for(function_name)
+            self._set_digest(function_id, digest)
+            self.counts[function_id] += 1
+            return self.counts[function_id]
+
+    def record_expansion(self, function_name):
+        """Mirrors a logged expansion and returns the new depth."""
+        with self._lock:
+            function_id = self._id_for(function_name)
+            self.depths[function_id] += 1
+            return self.depths[function_id]
+
+    def nbytes(self):
+        """Bytes held by the per-id arrays (names and the id map excluded)."""
+        return (len(self.digests) + self.counts.itemsize * len(self.counts)
+                + self.depths.itemsize * len(self.depths))
+
+
+_states = {}
+_states_lock = threading.Lock()
+
+
+def get_tracker_state(store):
+    """Returns the one AITrackerState mirroring `store`, shared by every tracker using it."""
+    with _states_lock:
+        state = _states.get(id(store))
+        if state is None or state.store is not store:
+            state = _states[id(store)] = AITrackerState(store)
+        return state
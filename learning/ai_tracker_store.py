@@ -0,0 +1,495 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class AIJSONTrackerStore:
+    """Fallback tracker store that keeps function and expansion logs in JSON files."""
+
+    FUNCTION_LOG = "function_modifications.json"
+    FRACTAL_LOG = "fractal_expansion_log.json"
+    DOCUMENT_DIR = ".ai_tracker"  # Documents are caches of the engine's own; kept out of the package
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.function_log = os.path.join(directory, self.FUNCTION_LOG)
+        self.fractal_log = os.path.join(directory, self.FRACTAL_LOG)
+        self._functions = None
+        self._expansions = None
+        self._documents = {}  # kind -> {key: value}, each kind kept in `.ai_tracker/<kind>.json`
+        self._batch_depth = 0
+        self._dirty = set()
+        self._loaded_stats = None  # (mtime_ns, size) of both logs as last read or written here
+        self._external_changes = 0
+        self.legacy_prefix = None  # Set by get_tracker_store: the module that owns bare-name records
+        self._lock = threading.RLock()
+
+    def _load(self, path):
+        """Loads one JSON log, resetting it if it is missing or corrupt."""
+        try:
+            with open(path, "r") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError:
+            logging.warning(f"⚠️ Corrupt JSON file detected: {path}. Resetting log...")
+            return {}
+
+    def _stats(self):
+        stats = []
+        for path in (self.function_log, self.fractal_log):
+            try:
+                stat = os.stat(path)
+                stats.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                stats.append(None)
+        return tuple(stats)
+
+    def _ensure_loaded(self):
+        if self._functions is None:
+            self._loaded_stats = self._stats()  # Taken first so a write racing the read is seen later
+            self._functions = self._load(self.function_log)
+            self._expansions = self._load(self.fractal_log)
+            self._adopt_legacy_records()
+
+    def _adopt_legacy_records(self):
+        """Moves records keyed by a bare function name onto `legacy_prefix`, merging counts."""
+        if not self.legacy_prefix:
+            return
+        functions = [name for name in self._functions if ":" not in name]
+        for function_name in functions:
+            record = self._functions.pop(function_name)
+            current = self._functions.get(self.legacy_prefix + function_name)
+            if current:  # Written after the switch to per-module keys: keep its hash, add the counts
+                record = {"modification_count": record.get("modification_count", 0)
+                          + current.get("modification_count", 0), "last_hash": current.get("last_hash")}
+            self._functions[self.legacy_prefix + function_name] = record
+        expansions = [name for name in self._expansions if ":" not in name]
+        for function_name in expansions:
+            depth = self._expansions.pop(function_name)
+            key = self.legacy_prefix + function_name
+            self._expansions[key] = self._expansions.get(key, 0) + depth
+        if functions:
+            self._save(self.function_log)
+        if expansions:
+            self._save(self.fractal_log)
+        if functions or expansions:
+            logging.info(f"📥 Moved {len(functions)} function and {len(expansions)} expansion records "
+                         f"onto {self.legacy_prefix}<name> keys in {self.directory}")
+
+    def _document_path(self, kind):
+        return os.path.join(self.directory, self.DOCUMENT_DIR, f"{kind}.json")
+
+    def _load_document_kind(self, kind):
+        """Loads one document file, first moving it out of the target directory where it used to live."""
+        path = self._document_path(kind)
+        legacy_path = os.path.join(self.directory, f"{kind}.json")
+        if not os.path.exists(path) and os.path.exists(legacy_path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(legacy_path, path)
+        return self._load(path)
+
+    def _save(self, path):
+        """Writes one log now, or marks it dirty while a batch is open."""
+        if self._batch_depth:
+            self._dirty.add(path)
+            return
+        if path == self.function_log:
+            data = self._functions
+        elif path == self.fractal_log:
+            data = self._expansions
+        else:
+            data = self._documents[os.path.basename(path)[:-len(".json")]]
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            json.dump(data, file, indent=4)
+        if path in (self.function_log, self.fractal_log):
+            self._loaded_stats = self._stats()  # Our own write is not an outside change
+
+    @contextmanager
+    def batch(self):
+        """Groups every write made inside the block into one dump per log file."""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    for path in sorted(self._dirty):
+                        self._save(path)
+                    self._dirty.clear()
+
+    def get_function(self, function_name):
+        """Returns `{"modification_count", "last_hash"}` for a function, or None."""
+        with self._lock:
+            self._ensure_loaded()
+            return self._functions.get(function_name)
+
+    def record_modification(self, function_name, function_hash):
+        """Stores the latest hash for a function and returns its modification count."""
+        with self._lock:
+            self._ensure_loaded()
+            count = self._functions.get(function_name, {}).get("modification_count", 0) + 1
+            self._functions[function_name] = {"modification_count": count, "last_hash": function_hash}
+            self._save(self.function_log)
+            return count
+
+    def get_expansion(self, function_name):
+        """Returns how many times a function has been expanded."""
+        with self._lock:
+            self._ensure_loaded()
+            return self._expansions.get(function_name, 0)
+
+    def record_expansion(self, function_name):
+        """Increments and returns the expansion depth of a function."""
+        with self._lock:
+            self._ensure_loaded()
+            depth = self._expansions.get(function_name, 0) + 1
+            self._expansions[function_name] = depth
+            self._save(self.fractal_log)
+            return depth
+
+    def iter_functions(self):
+        """Yields `(name, modification_count, last_hash)` for every tracked function."""
+        with self._lock:
+            self._ensure_loaded()
+            records = list(self._functions.items())
+        for function_name, record in records:
+            yield function_name, record.get("modification_count", 0), record.get("last_hash")
+
+    def iter_expansions(self):
+        """Yields `(name, depth)` for every expanded function."""
+        with self._lock:
+            self._ensure_loaded()
+            records = list(self._expansions.items())
+        yield from records
+
+    def load_document(self, kind, key):
+        """Returns a JSON-serializable document stored under (kind, key), or None."""
+        with self._lock:
+            if kind not in self._documents:
+                self._documents[kind] = self._load_document_kind(kind)
+            return self._documents[kind].get(key)
+
+    def save_document(self, kind, key, value):
+        """Stores a JSON-serializable document under (kind, key)."""
+        with self._lock:
+            self.load_document(kind, key)
+            self._documents[kind][key] = value
+            self._save(self._document_path(kind))
+
+    def version(self):
+        """Token that changes whenever another process rewrote the logs since they were loaded."""
+        with self._lock:
+            if self._functions is not None and self._stats() != self._loaded_stats:
+                self._external_changes += 1
+                self._loaded_stats = self._stats()
+            return self._external_changes
+
+    def watch_paths(self):
+        """Files holding this store's state, for watchers that react to outside changes."""
+        with self._lock:
+            return [self.function_log, self.fractal_log] + [self._document_path(kind) for kind in self._documents]
+
+    def reload(self):
+        """Drops the in-memory logs so the next read sees changes made by other processes."""
+        with self._lock:
+            if self._batch_depth:
+                return  # Unflushed batch writes would be lost
+            self._functions = None
+            self._expansions = None
+            self._documents = {}
+
+
+class AISQLiteTrackerStore:
+    """
+    Tracker store backed by one SQLite database in WAL mode. Several processes may
+    read and write it at once; counters are incremented in SQL so no update is lost.
+    """
+
+    DB_FILE = "ai_tracker.sqlite3"
+    BUSY_TIMEOUT_MS = 30000
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS functions (
+            name TEXT PRIMARY KEY,
+            modification_count INTEGER NOT NULL,
+            last_hash TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS expansions (
+            name TEXT PRIMARY KEY,
+            depth INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS documents (
+            kind TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value TEXT NOT NULL,
+            PRIMARY KEY (kind, key)
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.db_path = os.path.join(directory, self.DB_FILE)
+        self._conn = None
+        self._pid = None
+        self._batch_depth = 0
+        self._pending_functions = {}  # name -> [count delta, last hash]
+        self._pending_expansions = {}  # name -> depth delta
+        self._pending_documents = {}  # (kind, key) -> document
+        self.legacy_prefix = None  # Set by get_tracker_store: the module that owns bare-name records
+        self._lock = threading.RLock()
+
+    def _connection(self):
+        """Opens the database lazily, once per process (connections do not survive fork)."""
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=self.BUSY_TIMEOUT_MS / 1000,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={self.BUSY_TIMEOUT_MS}")
+            conn.executescript(self.SCHEMA)
+            self._conn, self._pid = conn, os.getpid()
+            self._import_json_logs()
+            self._adopt_legacy_records()
+        return self._conn
+
+    def _import_json_logs(self):
+        """Imports the legacy JSON logs from the same directory, exactly once."""
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'json_imported'").fetchone():
+                conn.execute("COMMIT")
+                return
+            legacy = AIJSONTrackerStore(self.directory)
+            legacy._ensure_loaded()
+            conn.executemany(
+                "INSERT OR IGNORE INTO functions VALUES (?, ?, ?)",
+                [(name, record.get("modification_count", 0), record.get("last_hash", ""))
+                 for name, record in legacy._functions.items()],
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO expansions VALUES (?, ?)",
+                list(legacy._expansions.items()),
+            )
+            conn.execute("INSERT INTO meta VALUES ('json_imported', '1')")
+            conn.execute("COMMIT")
+            if legacy._functions or legacy._expansions:
+                logging.info(f"📥 Imported {len(legacy._functions)} function and "
+                             f"{len(legacy._expansions)} expansion records into {self.db_path}")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _adopt_legacy_records(self):
+        """Moves records keyed by a bare function name onto `legacy_prefix`, exactly once."""
+        if not self.legacy_prefix:
+            return
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_keys_adopted'").fetchone():
+                conn.execute("COMMIT")
+                return
+            # Records written after the switch to per-module keys keep their hash; counts add up
+            functions = conn.execute(
+                "INSERT INTO functions SELECT ? || name, modification_count, last_hash FROM functions "
+                "WHERE instr(name, ':') = 0 ON CONFLICT(name) DO UPDATE SET "
+                "modification_count = modification_count + excluded.modification_count",
+                (self.legacy_prefix,),
+            ).rowcount
+            expansions = conn.execute(
+                "INSERT INTO expansions SELECT ? || name, depth FROM expansions "
+                "WHERE instr(name, ':') = 0 ON CONFLICT(name) DO UPDATE SET depth = depth + excluded.depth",
+                (self.legacy_prefix,),
+            ).rowcount
+            conn.execute("DELETE FROM functions WHERE instr(name, ':') = 0")
+            conn.execute("DELETE FROM expansions WHERE instr(name, ':') = 0")
+            conn.execute("INSERT INTO meta VALUES ('legacy_keys_adopted', ?)", (self.legacy_prefix,))
+            conn.execute("COMMIT")
+            if functions or expansions:
+                logging.info(f"📥 Moved {functions} function and {expansions} expansion records "
+                             f"onto {self.legacy_prefix}<name> keys in {self.db_path}")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    @contextmanager
+    def batch(self):
+        """Buffers every write made inside the block and commits them in one transaction."""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self._flush()
+
+    def _flush(self):
+        """Commits buffered writes in a single short write transaction."""
+        if not (self._pending_functions or self._pending_expansions or self._pending_documents):
+            return
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO functions VALUES (?, ?, ?) ON CONFLICT(name) DO UPDATE SET "
+                "modification_count = modification_count + excluded.modification_count, "
+                "last_hash = excluded.last_hash",
+                [(name, delta, last_hash) for name, (delta, last_hash) in self._pending_functions.items()],
+            )
+            conn.executemany(
+                "INSERT INTO expansions VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET "
+                "depth = depth + excluded.depth",
+                list(self._pending_expansions.items()),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO documents VALUES (?, ?, ?)",
+                [(kind, key, json.dumps(value)) for (kind, key), value in self._pending_documents.items()],
+            )
+        self._pending_functions.clear()
+        self._pending_expansions.clear()
+        self._pending_documents.clear()
+
+    def get_function(self, function_name):
+        """Returns `{"modification_count", "last_hash"}` for a function, or None."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT modification_count, last_hash FROM functions WHERE name = ?", (function_name,)
+            ).fetchone()
+            count, last_hash = row if row else (0, None)
+            pending = self._pending_functions.get(function_name)
+            if pending:
+                count, last_hash = count + pending[0], pending[1]
+            if last_hash is None:
+                return None
+            return {"modification_count": count, "last_hash": last_hash}
+
+    def record_modification(self, function_name, function_hash):
+        """Stores the latest hash for a function and returns its modification count."""
+        with self._lock:
+            pending = self._pending_functions.setdefault(function_name, [0, function_hash])
+            pending[0] += 1
+            pending[1] = function_hash
+            count = self.get_function(function_name)["modification_count"]
+            if not self._batch_depth:
+                self._flush()
+            return count
+
+    def get_expansion(self, function_name):
+        """Returns how many times a function has been expanded."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT depth FROM expansions WHERE name = ?", (function_name,)
+            ).fetchone()
+            return (row[0] if row else 0) + self._pending_expansions.get(function_name, 0)
+
+    def record_expansion(self, function_name):
+        """Increments and returns the expansion depth of a function."""
+        with self._lock:
+            self._pending_expansions[function_name] = self._pending_expansions.get(function_name, 0) + 1
+            depth = self.get_expansion(function_name)
+            if not self._batch_depth:
+                self._flush()
+            return depth
+
+    def iter_functions(self):
+        """Yields `(name, modification_count, last_hash)` for every tracked function."""
+        with self._lock:  # Rows are streamed; pending batch writes are overlaid on the fly
+            pending = dict(self._pending_functions)
+            for function_name, count, last_hash in self._connection().execute(
+                    "SELECT name, modification_count, last_hash FROM functions"):
+                overlay = pending.pop(function_name, None)
+                if overlay:
+                    count, last_hash = count + overlay[0], overlay[1]
+                yield function_name, count, last_hash
+            for function_name, (delta, last_hash) in pending.items():
+                yield function_name, delta, last_hash
+
+    def iter_expansions(self):
+        """Yields `(name, depth)` for every expanded function."""
+        with self._lock:
+            pending = dict(self._pending_expansions)
+            for function_name, depth in self._connection().execute("SELECT name, depth FROM expansions"):
+                yield function_name, depth + pending.pop(function_name, 0)
+            yield from pending.items()
+
+    def load_document(self, kind, key):
+        """Returns a JSON-serializable document stored under (kind, key), or None."""
+        with self._lock:
+            if (kind, key) in self._pending_documents:
+                return self._pending_documents[(kind, key)]
+            row = self._connection().execute(
+                "SELECT value FROM documents WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+            return json.loads(row[0]) if row else None
+
+    def save_document(self, kind, key, value):
+        """Stores a JSON-serializable document under (kind, key)."""
+        with self._lock:
+            self._pending_documents[(kind, key)] = value
+            if not self._batch_depth:
+                self._flush()
+
+    def version(self):
+        """Token that changes whenever another connection committed (SQLite's data_version)."""
+        with self._lock:
+            conn = self._connection()
+            return self._pid, conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def watch_paths(self):
+        """Files holding this store's state, for watchers that react to outside changes."""
+        return [self.db_path, self.db_path + "-wal"]
+
+    def reload(self):
+        """Nothing is cached outside the database: every read already sees other processes' commits."""
+
+
+TRACKER_BACKENDS = {
+    "sqlite": AISQLiteTrackerStore,
+    "json": AIJSONTrackerStore,
+}
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def record_prefix(store, file_path):
+    """
+    Key prefix of one module's records. A store is shared by every module of its
+    directory, so records are keyed `<module path>:<function name>` rather than by the
+    bare name, which would merge e.g. the `main` functions of different files.
+    """
+    return os.path.relpath(os.path.abspath(file_path), store.directory).replace(os.sep, "/") + ":"
+
+
+def get_tracker_store(file_path, backend=None):
+    """
+    Returns the tracker store shared by every tracker of `file_path`. State lives next
+    to the target file, not in the CWD. The backend defaults to SQLite and can be
+    switched with the GENESISX_TRACKER_BACKEND environment variable. Records from
+    before per-module keys carry a bare function name; the module that opens the
+    store first, the engine's target, takes them over on first load.
+    """
+    backend = backend or os.environ.get("GENESISX_TRACKER_BACKEND", "sqlite")
+    if backend not in TRACKER_BACKENDS:
+        raise ValueError(f"Unknown tracker backend: {backend}")
+    directory = os.path.dirname(os.path.abspath(file_path))
+    with _stores_lock:
+        store = _stores.get((directory, backend))
+        if store is None:
+            store = _stores[(directory, backend)] = TRACKER_BACKENDS[backend](directory)
+            store.legacy_prefix = record_prefix(store, file_path)
+        return store
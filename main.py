@@ -1,3 +1,4 @@
+import argparse
 import logging
 import os
 import sys
@@ -29,35 +30,80 @@ remove_pycache(os.path.abspath(os.path.dirname(__file__)))
 # Configure logging for debugging
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 
-if __name__ == "__main__":
-    logging.info("🚀 Running Self-Modifying AI...")
-
-    # Path to the AI core script
-    ai_core_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "ai_core.py"))
-
-    # Initialize AI
-    ai = SelfModifyingAI(ai_core_path)
 
+def run_cycle(ai):
+    """One full self-modification cycle as run from the command line."""
     logging.info("🔄 Running AI Learning Cycle...")
-    ai.learning_manager.run_learning_cycle()  # Runs Fractal Learning Expansion
+    with ai.phase("learning_cycle"):
+        ai.learning_manager.run_learning_cycle()  # Runs Fractal Learning Expansion
 
     logging.info("🔍 Tracking Recursive Learning Layers...")
-    function_report = ai.learning_manager.analyzer.analyze_code()
-    for function_name in function_report:
-        ai.learning_manager.fractal_tracker.log_expansion(function_name)
-        ai.learning_manager.function_tracker.log_modification(function_name, "dummy_code")
+    with ai.phase("tracking"):
+        function_report = ai.learning_manager.analyzer.analyze_code()
+        with ai.learning_manager.function_tracker.store.batch():
+            for function_name in function_report:
+                ai.learning_manager.fractal_tracker.log_expansion(function_name)
+                ai.learning_manager.function_tracker.log_modification(function_name, "dummy_code")
 
     logging.info("🔍 Analyzing AI source code for inefficiencies...")
-    function_report = ai.learning_manager.analyzer.analyze_code()
+    with ai.phase("analysis"):
+        function_report = ai.learning_manager.analyzer.analyze_code()
 
     logging.info("🛠 Applying AI self-optimizations...")
-    ai.learning_manager.optimizer.optimize_functions(function_report)
+    with ai.phase("optimization"):
+        ai.learning_manager.optimizer.optimize_functions(function_report)
     
     # **NEW: Run Recursive Function Rewriting**
     logging.info("🔁 Running Recursive Function Rewriting...")
-    ai.function_rewriter.rewrite_and_adapt()  # ✅ Runs AI function rewriting
+    with ai.phase("rewriting"):
+        ai.function_rewriter.rewrite_and_adapt()  # ✅ Runs AI function rewriting
 
     logging.info("📜 Displaying updated AI source code...")
-    ai.reader.display_code()
+    with ai.phase("display"):
+        ai.reader.display_code()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the self-modifying AI engine.")
+    parser.add_argument("--cycles", type=int, default=1, help="Number of cycles to run")
+    parser.add_argument("--profile", metavar="DIR",
+                        help="Write cProfile/tracemalloc reports per phase into DIR")
+    parser.add_argument("--profile-every", type=int, default=1, metavar="N",
+                        help="Profile one cycle in every N")
+    parser.add_argument("--profile-top", type=int, default=25, metavar="N",
+                        help="Entries kept in each profile report")
+    parser.add_argument("--watch", nargs="*", metavar="PATH",
+                        help="Stay running and rerun cycles when these files (default: ai_core.py) change")
+    parser.add_argument("--debounce", type=float, default=0.1, metavar="SECONDS",
+                        help="Quiet period that ends a burst of changes in watch mode")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    logging.info("🚀 Running Self-Modifying AI...")
+
+    # Path to the AI core script
+    ai_core_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "ai_core.py"))
+
+    if args.watch is not None:
+        from core_engine.ai_daemon import AIDaemon
+        AIDaemon(args.watch or [ai_core_path], debounce=args.debounce).run()
+        sys.exit(0)
+
+    # Initialize AI
+    ai = SelfModifyingAI(ai_core_path)
+    if args.profile:
+        from core_engine.execution.ai_profiler import AIProfiler
+        ai.profiler = AIProfiler(args.profile, every=args.profile_every, top_n=args.profile_top)
+
+    for _ in range(args.cycles):
+        ai.reader.snapshot()  # Display only what this cycle changes
+        if ai.profiler is None:
+            run_cycle(ai)
+        else:
+            with ai.profiler.cycle():
+                run_cycle(ai)
 
+    logging.info(f"📊 Cycle metrics:\n{ai.metrics.to_json()}")
     logging.info("✅ AI self-modification process completed.")
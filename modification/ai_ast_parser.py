@@ -1,6 +1,8 @@
-import ast
 import logging
+from core_engine.execution.ai_metrics import AIMetrics
 from core_engine.modification.ai_utils import AIUtils
+from core_engine.modification.ai_function_metrics import AIFunctionMetrics
+from core_engine.learning.ai_fingerprint_index import AIFingerprintIndex
 
 class AIASTParser:
     """Parses and analyzes the AI's own source code using Abstract Syntax Trees (ASTs)."""
@@ -8,34 +10,53 @@ class AIASTParser:
     def __init__(self, file_path):
         self.file_path = file_path
         self.utils = AIUtils(file_path)
+        self.fingerprints = AIFingerprintIndex(file_path)
+        self.changed_functions = set()  # Functions whose fingerprint changed in the last extraction
 
-    def parse_code(self):
-        """Reads and parses the AI's source code into an AST."""
-        source_code = self.utils.read_source_code()
+    def parse_code(self, mutable=False):
+        """
+        Returns the AI's source code as an AST from the shared source cache.
+        Pass `mutable=True` when the tree will be transformed in place.
+        """
         try:
-            tree = ast.parse(source_code)
+            tree = self.utils.cache.get_tree(self.file_path, mutable=mutable)
             logging.info("✅ Successfully parsed AI's source code into an AST.")
             return tree
         except SyntaxError as e:
             logging.error(f"❌ Syntax error detected in AI's source code: {e}")
             return None
 
+    def analyze_function(self, node):
+        """Computes the metrics of a single function definition in one visitor pass."""
+        return AIFunctionMetrics.measure(node)
+
     def extract_function_definitions(self):
-        """Extracts function structures from the AI's source code."""
+        """
+        Extracts function structures from the AI's source code. Only functions whose
+        fingerprint changed are re-analyzed; the rest reuse their cached reports.
+        """
         tree = self.parse_code()
         if not tree:
+            self.changed_functions = set()
             return {}
 
+        source_code = self.utils.read_source_code()
+        file_hash = self.utils.cache.get_hash(self.file_path)
+        fingerprints, changed = self.fingerprints.changed_functions(source_code, tree, file_hash)
+
         function_details = {}
+        for node in self.fingerprints.function_nodes(tree):
+            if node.name in changed:
+                function_details[node.name] = self.analyze_function(node)
+
+        for function_name in fingerprints:
+            if function_name not in function_details:
+                report = self.fingerprints.cached_report(function_name)
+                function_details[function_name] = report if report is not None else {}
 
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                function_details[node.name] = {
-                    "parameters": len(node.args.args),
-                    "num_statements": len(node.body),
-                    "contains_loops": any(isinstance(stmt, (ast.For, ast.While)) for stmt in node.body),
-                    "contains_conditionals": any(isinstance(stmt, ast.If) for stmt in node.body),
-                }
+        self.fingerprints.update(file_hash, fingerprints, function_details)
+        AIMetrics.shared().incr("functions_analyzed", len(changed))
+        self.changed_functions = changed
 
         logging.info(f"📜 Extracted function definitions: {function_details}")
         return function_details
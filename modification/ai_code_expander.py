@@ -1,11 +1,30 @@
 import ast
+import functools
 import random
 import logging
 import json
 import hashlib
-import os
 from core_engine.execution.ai_sandbox import AISandbox
+from core_engine.execution.ai_metrics import AIMetrics
 from core_engine.learning.ai_function_tracker import AIFunctionTracker
+from core_engine.modification.ai_generated_store import AIGeneratedStore
+
+try:
+    import numpy as np
+except ImportError:  # Optional: population scoring falls back to pure Python
+    np = None
+
+
+@functools.lru_cache(maxsize=None)
+def _template_kernel(template):
+    """
+    Compiles the return expression of a function template into `kernel(x, y, value)`, so
+    population scoring evaluates exactly the arithmetic the emitted code performs.
+    """
+    function = ast.parse(template.format(name="kernel", value="value")).body[0]
+    returned = next(node.value for node in ast.walk(function) if isinstance(node, ast.Return))
+    return eval(compile(f"lambda x, y, value: {ast.unparse(returned)}", "<template kernel>", "eval"))
+
 
 class AICodeExpander:
     """Handles AI-generated function expansion while maintaining code stability."""
@@ -21,20 +40,33 @@ class AICodeExpander:
     print('Executing AI-generated function {name} with values:', x, y)
     return (x + y) * {value}"""
     ]
+    VALUE_RANGE = (1, 100)
+    POPULATION_KEEP = 8
+    POPULATION_INPUTS = 64  # Evaluation points per candidate
 
-    def __init__(self, file_path):
+    @staticmethod
+    def population_target(x, y):
+        """Behaviour the population is scored against (mean squared error, lower is better)."""
+        return x * y
+
+    def __init__(self, file_path, sandbox=None, function_tracker=None, generated_store=None,
+                 population_size=0):
+        """With `population_size` > 0, `expand_code` runs population mode instead of one random function."""
         self.file_path = file_path
-        self.generated_functions_file = os.path.join(os.path.dirname(file_path), "ai_generated.py")
-        self.sandbox = AISandbox()
-        self.function_tracker = AIFunctionTracker(file_path)
+        self.population_size = population_size
+        self.generated_store = generated_store or AIGeneratedStore(file_path)  # Replaces appending to ai_generated.py
+        self.sandbox = sandbox or AISandbox()
+        self.function_tracker = function_tracker or AIFunctionTracker(file_path)
         self.generated_functions = []
 
     def generate_function(self):
-        """Generates a new function dynamically."""
-        function_name = f"ai_generated_{random.randint(1000, 9999)}"
-        template = random.choice(self.FUNCTION_TEMPLATES)
-        value = random.randint(1, 100)
-        function_code = template.format(name=function_name, value=value)
+        """Generates a new function dynamically; its name is derived from its body."""
+        template_index = random.randrange(len(self.FUNCTION_TEMPLATES))
+        content_hash, function_name, function_code = self._source(template_index, random.randint(*self.VALUE_RANGE))
+
+        if self.generated_store.find_by_hash(content_hash):
+            logging.info(f"🔄 Skipping duplicate function: {function_name}")
+            return function_name, None
 
         if self.function_tracker.has_changed(function_name, function_code):
             self.function_tracker.log_modification(function_name, function_code)
@@ -46,19 +78,103 @@ class AICodeExpander:
         return function_name, function_code
 
     def inject_function(self, function_name, function_code):
-        """Injects the generated function into `ai_generated.py` without modifying core files."""
+        """Injects the generated function into the generated-function store without modifying core files."""
         try:
-            with open(self.generated_functions_file, "a", encoding="utf-8") as f:
-                f.write("\n" + function_code + "\n")
-
-            logging.info(f"✅ AI-generated function `{function_name}` successfully injected into `ai_generated.py`.")
+            if self.generated_store.add(function_name, function_code):
+                AIMetrics.shared().incr("functions_generated")
+                logging.info(f"✅ AI-generated function `{function_name}` successfully injected into the generated store.")
+            else:
+                logging.info(f"🔄 Identical body already stored; `{function_name}` was not duplicated.")
 
         except Exception as e:
             logging.error(f"❌ Function injection failed: {e}")
 
+    def _source(self, template_index, value):
+        """Returns `(content_hash, name, code)` of one candidate."""
+        template = self.FUNCTION_TEMPLATES[template_index]
+        placeholder = AIGeneratedStore.NAME_PLACEHOLDER
+        content_hash = AIGeneratedStore.content_hash(placeholder, template.format(name=placeholder, value=value))
+        function_name = AIGeneratedStore.name_for(content_hash)
+        return content_hash, function_name, template.format(name=function_name, value=value)
+
+    def score_population(self, candidates, target=None):
+        """
+        Scores `(template_index, value)` candidates by mean squared error against `target(x, y)`
+        over POPULATION_INPUTS points. Uses NumPy to evaluate each template group as one array
+        operation when available; returns one score per candidate.
+        """
+        target = target or self.population_target
+        count = self.POPULATION_INPUTS
+        kernels = [_template_kernel(template) for template in self.FUNCTION_TEMPLATES]
+        if np is None:
+            points = [(-10 + 20 * i / (count - 1), 10 - 15 * i / (count - 1)) for i in range(count)]
+            expected = [target(x, y) for x, y in points]
+            return [
+                sum((kernels[index](x, y, value) - want) ** 2
+                    for (x, y), want in zip(points, expected)) / count
+                for index, value in candidates
+            ]
+
+        x = np.linspace(-10, 10, count)
+        y = np.linspace(10, -5, count)
+        expected = np.asarray(target(x, y), dtype=float)
+        indices = np.fromiter((index for index, _ in candidates), dtype=np.int64, count=len(candidates))
+        values = np.fromiter((value for _, value in candidates), dtype=float, count=len(candidates))
+        scores = np.empty(len(candidates))
+        for index, kernel in enumerate(kernels):
+            group = indices == index
+            if group.any():
+                outputs = np.broadcast_to(  # (candidates, inputs), also for kernels ignoring x and y
+                    kernel(x[None, :], y[None, :], values[group][:, None]), (group.sum(), count))
+                scores[group] = ((outputs - expected) ** 2).mean(axis=1)
+        return scores.tolist()
+
+    def expand_population(self, size=None, keep=POPULATION_KEEP, target=None):
+        """
+        Population mode: draws `size` candidates, scores them all at once, keeps the `keep`
+        best that are not stored yet, checks them in one sandbox batch and writes the
+        survivors in one transaction. Returns the names that were stored.
+        """
+        size = size or self.population_size
+        low, high = self.VALUE_RANGE
+        drawn = {(random.randrange(len(self.FUNCTION_TEMPLATES)), random.randint(low, high)) for _ in range(size)}
+        candidates = sorted(drawn)  # Duplicates in the draw are scored once
+        scores = self.score_population(candidates, target)
+        ranked = sorted(zip(scores, candidates))
+
+        survivors = []
+        for score, (template_index, value) in ranked:
+            if len(survivors) >= keep:
+                break
+            content_hash, function_name, function_code = self._source(template_index, value)
+            if not self.generated_store.find_by_hash(content_hash):
+                survivors.append((function_name, function_code, score))
+        logging.info(f"🧪 Scored {len(candidates)} unique candidates from a population of {size}; "
+                     f"{len(survivors)} new survivors.")
+        if not survivors:
+            return []
+
+        passed = self.sandbox.test_batch([function_code for _, function_code, _ in survivors])
+        survivors = [survivor for survivor, ok in zip(survivors, passed) if ok]
+
+        with self.function_tracker.store.batch():
+            for function_name, function_code, score in survivors:
+                self.function_tracker.log_modification(function_name, function_code)
+                logging.info(f"📝 Survivor `{function_name}` (MSE {score:.2f})")
+        inserted = self.generated_store.add_many([(name, code) for name, code, _ in survivors])
+        self.generated_functions.extend(inserted)
+        AIMetrics.shared().incr("functions_generated", len(inserted))
+        logging.info(f"✅ Stored {len(inserted)} AI-generated functions in one batch.")
+        return inserted
+
     def expand_code(self):
         """Creates, injects, and logs AI-generated functions dynamically."""
+        if self.population_size:
+            return self.expand_population()
         function_name, new_function_code = self.generate_function()
+        if new_function_code and not self.sandbox.test_code(new_function_code):
+            logging.error(f"❌ AI-generated function `{function_name}` failed in the sandbox. Skipping injection.")
+            return None
         if new_function_code:
             logging.info(f"🔬 Injecting AI-generated function `{function_name}`...")
             self.inject_function(function_name, new_function_code)
@@ -0,0 +1,130 @@
+import ast
+
+
+class AIFunctionMetrics(ast.NodeVisitor):
+    """
+    Single-pass metrics visitor for one function definition; nested function definitions
+    are left to their own report. Only `for`/`while`/`async for` statements count as loops
+    (`contains_loops`, `max_loop_depth`) and only `if`/`match` statements as conditionals,
+    at any depth. Comprehensions are counted separately: they add to complexity, and calls
+    and attribute lookups in their per-item parts count as inside loops.
+    """
+
+    def __init__(self):
+        self.complexity = 1
+        self.loop_depth = 0  # Statement loops only
+        self.iteration_depth = 0  # Statement loops and comprehension generators
+        self.max_loop_depth = 0
+        self.calls_in_loops = 0
+        self.attribute_lookups_in_loops = 0
+        self.comprehensions = 0
+        self.conditionals = 0
+
+    @classmethod
+    def measure(cls, node):
+        """Returns the metrics report of a function definition."""
+        visitor = cls()
+        for stmt in node.body:
+            visitor.visit(stmt)
+        return {
+            "parameters": len(node.args.args),
+            "num_statements": len(node.body),
+            "contains_loops": visitor.max_loop_depth > 0,
+            "contains_conditionals": visitor.conditionals > 0,
+            "cyclomatic_complexity": visitor.complexity,
+            "max_loop_depth": visitor.max_loop_depth,
+            "calls_in_loops": visitor.calls_in_loops,
+            "attribute_lookups_in_loops": visitor.attribute_lookups_in_loops,
+            "comprehensions": visitor.comprehensions,
+        }
+
+    def _visit_loop(self, node, header, body):
+        """Visits a loop's one-time `header` at the current depth and its `body` one level deeper."""
+        self.complexity += 1
+        for child in header:
+            self.visit(child)
+        self.loop_depth += 1
+        self.iteration_depth += 1
+        self.max_loop_depth = max(self.max_loop_depth, self.loop_depth)
+        for child in body:
+            self.visit(child)
+        self.loop_depth -= 1
+        self.iteration_depth -= 1
+        for child in node.orelse:  # `else` runs once, after the loop
+            self.visit(child)
+
+    def visit_For(self, node):
+        self._visit_loop(node, (node.target, node.iter), node.body)
+
+    visit_AsyncFor = visit_For
+
+    def visit_While(self, node):
+        self._visit_loop(node, (), [node.test] + node.body)
+
+    def visit_If(self, node):
+        self.complexity += 1
+        self.conditionals += 1
+        self.generic_visit(node)
+
+    def visit_IfExp(self, node):
+        self.complexity += 1
+        self.generic_visit(node)
+
+    def visit_Match(self, node):
+        self.complexity += len(node.cases)
+        self.conditionals += 1
+        self.generic_visit(node)
+
+    def visit_ExceptHandler(self, node):
+        self.complexity += 1
+        self.generic_visit(node)
+
+    def visit_Assert(self, node):
+        self.complexity += 1
+        self.generic_visit(node)
+
+    def visit_BoolOp(self, node):
+        self.complexity += len(node.values) - 1
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        if self.iteration_depth:
+            self.calls_in_loops += 1
+        self.generic_visit(node)
+
+    def visit_Attribute(self, node):
+        if self.iteration_depth:
+            self.attribute_lookups_in_loops += 1
+        self.generic_visit(node)
+
+    def _visit_comprehension(self, node, elements):
+        self.comprehensions += 1
+        self.visit(node.generators[0].iter)  # Only the outermost iterable is evaluated once
+        depth = self.iteration_depth
+        for index, generator in enumerate(node.generators):
+            self.complexity += 1 + len(generator.ifs)
+            if index:
+                self.visit(generator.iter)
+            self.iteration_depth += 1
+            self.visit(generator.target)
+            for condition in generator.ifs:
+                self.visit(condition)
+        for element in elements:
+            self.visit(element)
+        self.iteration_depth = depth
+
+    def visit_ListComp(self, node):
+        self._visit_comprehension(node, (node.elt,))
+
+    visit_SetComp = visit_ListComp
+    visit_GeneratorExp = visit_ListComp
+
+    def visit_DictComp(self, node):
+        self._visit_comprehension(node, (node.key, node.value))
+
+    def visit_FunctionDef(self, node):
+        for decorator in node.decorator_list:  # Decorators run here; the body belongs to its own report
+            self.visit(decorator)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+    visit_ClassDef = visit_FunctionDef
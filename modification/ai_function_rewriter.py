@@ -1,18 +1,23 @@
 import ast
 import copy
+import io
 import logging
-import time
 import hashlib
 from core_engine.execution.ai_sandbox import AISandbox
+from core_engine.execution.ai_benchmark import AIBenchmark
+from core_engine.execution.ai_metrics import AIMetrics
 from core_engine.learning.ai_function_tracker import AIFunctionTracker
+from core_engine.modification.ai_source_cache import AISourceCache
 
 class AIFunctionRewriter:
     """Handles recursive function rewriting and adaptive modifications."""
 
-    def __init__(self, file_path):
+    def __init__(self, file_path, sandbox=None, function_tracker=None):
         self.file_path = file_path
-        self.sandbox = AISandbox()
-        self.function_tracker = AIFunctionTracker(file_path)
+        self.sandbox = sandbox or AISandbox()
+        self.benchmark = AIBenchmark(self.sandbox)
+        self.metrics = AIMetrics.shared()
+        self.function_tracker = function_tracker or AIFunctionTracker(file_path)
 
     def analyze_function(self, function_node):
         """Analyze function metrics such as complexity and branching."""
@@ -24,8 +29,11 @@ class AIFunctionRewriter:
         }
 
     def modify_function(self, function_node):
-        """Apply adaptive modifications to function logic dynamically."""
-        new_node = copy.deepcopy(function_node)
+        """
+        Apply adaptive modifications to function logic dynamically. Only the function node
+        itself is copied; the new body list shares every original statement subtree.
+        """
+        new_node = copy.copy(function_node)
 
         # Add a logging statement to the start of the function
         logging_stmt = ast.Expr(
@@ -40,35 +48,83 @@ class AIFunctionRewriter:
             )
         )
 
-        new_node.body.insert(0, logging_stmt)
+        new_node.body = [logging_stmt] + function_node.body
         return new_node
 
-    def evaluate_function(self, function_code):
-        """Evaluate the modified function's performance."""
-        start_time = time.time()
-        try:
-            exec(function_code, {})
-            execution_time = time.time() - start_time
-            return execution_time  # Using execution time as a performance metric
-        except Exception as e:
-            logging.error(f"Error during function evaluation: {e}")
-            return float('inf')  # Penalize functions that raise exceptions
+    @staticmethod
+    def _segment(lines, node):
+        """Source lines of a function (decorators included), dedented to column 0."""
+        start = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+        indent = node.col_offset
+        return [line[indent:] if line[:indent].isspace() else line
+                for line in lines[start - 1:node.end_lineno]], start
 
-    def rewrite_and_adapt(self):
-        """Main method to perform recursive rewriting and adaptive modifications."""
-        with open(self.file_path, 'r', encoding='utf-8') as file:
-            source_code = file.read()
+    def _splice(self, lines, node, modified_node):
+        """
+        Returns `(original_code, modified_code)` for a function. The modified code is the
+        original text with the new leading statement spliced in above the first body line,
+        so the body is never unparsed; one-line bodies fall back to unparsing the node.
+        """
+        segment, start = self._segment(lines, node)
+        original_code = "".join(segment)
+        first = node.body[0]
+        first_line = lines[first.lineno - 1]
+        if first_line[:first.col_offset].strip():  # Body shares the `def` line
+            return original_code, ast.unparse(modified_node)
 
-        tree = ast.parse(source_code)
+        offset = first.lineno - start
+        indent = first_line[:first.col_offset][node.col_offset:]
+        inserted = f"{indent}{ast.unparse(modified_node.body[0])}\n"
+        return original_code, "".join(segment[:offset] + [inserted] + segment[offset:])
+
+    def evaluate_function(self, function_name, original_code, modified_code):
+        """Benchmark the modified function against the original on real calls."""
+        return self.benchmark.compare(function_name, original_code, modified_code, self._prelude())
+
+    def _prelude(self):
+        """Top-level imports of the target file, so benchmarked functions resolve their globals."""
+        tree = AISourceCache.shared().get_tree(self.file_path)
+        imports = [stmt for stmt in tree.body if isinstance(stmt, (ast.Import, ast.ImportFrom))]
+        return "\n".join(ast.unparse(stmt) for stmt in imports)
+
+    def rewrite_and_adapt(self, function_names=None):
+        """
+        Main method to perform recursive rewriting and adaptive modifications. When
+        `function_names` is given (e.g. the call graph's affected set), only those
+        functions are considered and benchmarked.
+        """
+        cache = AISourceCache.shared()
+        tree = cache.get_tree(self.file_path)  # Read-only: edits copy only the nodes they change
+        lines = io.StringIO(cache.get_source(self.file_path), newline="").readlines()  # As ast counts lines
+        candidates = []
         for node in ast.walk(tree):
             if isinstance(node, ast.FunctionDef):
+                if function_names is not None and node.name not in function_names:
+                    continue
                 original_metrics = self.analyze_function(node)
                 modified_node = self.modify_function(node)
-                modified_code = ast.unparse(modified_node)
+                original_code, modified_code = self._splice(lines, node, modified_node)
 
                 if self.function_tracker.has_changed(node.name, modified_code):
-                    performance = self.evaluate_function(modified_code)
-                    logging.info(f"Function {node.name} - Original Metrics: {original_metrics}, Performance: {performance}")
-                    self.function_tracker.log_modification(node.name, modified_code)
+                    candidates.append((node.name, original_code, modified_code, original_metrics))
                 else:
                     logging.info(f"Skipping redundant modification for {node.name}")
+                    self.metrics.incr("functions_skipped")
+
+        # Benchmark every candidate in one parallel batch before anything is logged
+        reports = self.benchmark.compare_many(
+            [(name, original_code, modified_code) for name, original_code, modified_code, _ in candidates],
+            self._prelude(),
+        ) if candidates else []
+
+        modified_functions = []
+        for (name, _, modified_code, original_metrics), report in zip(candidates, reports):
+            if report["verdict"] in ("regression", "broken"):
+                logging.warning(f"⚠️ Rejected rewrite of {name}: {report['verdict']} ({report.get('change', report.get('reason'))})")
+                self.metrics.incr("functions_rejected")
+                continue
+            logging.info(f"Function {name} - Original Metrics: {original_metrics}, Performance: {report}")
+            self.function_tracker.log_modification(name, modified_code)
+            modified_functions.append(name)
+            self.metrics.incr("rewrites_accepted")
+        return modified_functions
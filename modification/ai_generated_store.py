@@ -0,0 +1,181 @@
+import ast
+import hashlib
+import logging
+import marshal
+import os
+import sqlite3
+import sys
+import threading
+
+
+class AIGeneratedStore:
+    """
+    Indexed store for AI-generated functions. Functions are keyed by a hash of their
+    body (with the function's own name masked), so identical bodies are stored once.
+    Compiled code objects are cached with `marshal` and a function is only compiled or
+    executed when it is actually requested.
+    """
+
+    DB_FILE = "ai_generated.sqlite3"
+    LEGACY_FILE = "ai_generated.py"
+    NAME_PLACEHOLDER = "__ai_function_name__"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS functions (
+            name TEXT PRIMARY KEY,
+            content_hash TEXT NOT NULL UNIQUE,
+            source TEXT NOT NULL,
+            code BLOB,
+            cache_tag TEXT
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    def __init__(self, file_path):
+        self.directory = os.path.dirname(os.path.abspath(file_path))
+        self.db_path = os.path.join(self.directory, self.DB_FILE)
+        self._conn = None
+        self._pid = None
+        self._loaded = {}  # name -> function object, filled on demand
+        self._lock = threading.RLock()
+
+    @classmethod
+    def content_hash(cls, function_name, source):
+        """Hashes a function body independently of the name it was given."""
+        canonical = source.strip().replace(function_name, cls.NAME_PLACEHOLDER)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def name_for(cls, content_hash):
+        """Deterministic, collision-free name for a function body."""
+        return f"ai_generated_{content_hash[:16]}"
+
+    def _connection(self):
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.SCHEMA)
+            self._conn, self._pid = conn, os.getpid()
+            self._import_legacy_module()
+        return self._conn
+
+    def _import_legacy_module(self):
+        """Imports the functions of the old append-only `ai_generated.py` once, keeping their names."""
+        conn = self._conn
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_imported'").fetchone():
+            return
+        legacy_path = os.path.join(self.directory, self.LEGACY_FILE)
+        definitions = {}
+        if os.path.exists(legacy_path):
+            with open(legacy_path, "r", encoding="utf-8") as file:
+                source_code = file.read()
+            for node in ast.parse(source_code).body:
+                if isinstance(node, ast.FunctionDef):
+                    # A repeated name keeps its last definition, as executing the module did
+                    definitions[node.name] = ast.get_source_segment(source_code, node)
+        items = list(definitions.items())
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._insert(conn, items)
+            conn.execute("INSERT OR IGNORE INTO meta VALUES ('legacy_imported', '1')")
+        if items:
+            logging.info(f"📥 Imported {len(items)} legacy AI-generated functions into {self.db_path}")
+
+    @classmethod
+    def _insert(cls, conn, items):
+        """Inserts `(name, source)` pairs, skipping bodies that already exist."""
+        inserted = []
+        for function_name, source in items:
+            content_hash = cls.content_hash(function_name, source)
+            code = compile(source, f"<ai_generated:{function_name}>", "exec")
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO functions VALUES (?, ?, ?, ?, ?)",
+                (function_name, content_hash, source, marshal.dumps(code), sys.implementation.cache_tag),
+            )
+            if cursor.rowcount:
+                inserted.append(function_name)
+        return inserted
+
+    def find_by_hash(self, content_hash):
+        """Returns the name already stored for a body, or None."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT name FROM functions WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+            return row[0] if row else None
+
+    def add(self, function_name, source):
+        """Stores one function; returns False if an identical body is already stored."""
+        return bool(self.add_many([(function_name, source)]))
+
+    def add_many(self, items):
+        """Stores many `(name, source)` pairs in one transaction; returns the names inserted."""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                return self._insert(conn, items)
+
+    def load_function(self, function_name):
+        """Returns the function object for `function_name`, or None if it is not stored."""
+        with self._lock:
+            if function_name in self._loaded:
+                return self._loaded[function_name]
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT source, code, cache_tag FROM functions WHERE name = ?", (function_name,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            source, code_blob, cache_tag = row
+            if code_blob is not None and cache_tag == sys.implementation.cache_tag:
+                code = marshal.loads(code_blob)
+            else:
+                # Cached bytecode belongs to another interpreter version: recompile and refresh it
+                code = compile(source, f"<ai_generated:{function_name}>", "exec")
+                with conn:
+                    conn.execute("UPDATE functions SET code = ?, cache_tag = ? WHERE name = ?",
+                                 (marshal.dumps(code), sys.implementation.cache_tag, function_name))
+
+            namespace = {"__name__": "ai_generated"}
+            exec(code, namespace)
+            function = namespace[function_name]
+            self._loaded[function_name] = function
+            return function
+
+    def get_source(self, function_name):
+        """Returns the stored source of a function, or None."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT source FROM functions WHERE name = ?", (function_name,)
+            ).fetchone()
+            return row[0] if row else None
+
+    def names(self):
+        """Lists every stored function name."""
+        with self._lock:
+            return [row[0] for row in self._connection().execute("SELECT name FROM functions ORDER BY name")]
+
+    def count(self):
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM functions").fetchone()[0]
+
+
+class AIGeneratedNamespace:
+    """Module-like view over the store: attribute access loads just that function."""
+
+    def __init__(self, store):
+        self._store = store
+
+    def __getattr__(self, function_name):
+        function = self._store.load_function(function_name)
+        if function is None:
+            raise AttributeError(f"No AI-generated function named {function_name!r}")
+        return function
+
+    def __dir__(self):
+        return self._store.names()
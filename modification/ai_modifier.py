@@ -1,27 +1,152 @@
 import ast
-import astor  # type: ignore
 import logging
+import textwrap
+from core_engine.execution.ai_metrics import AIMetrics
 from core_engine.modification.ai_utils import AIUtils
 from core_engine.modification.ai_ast_parser import AIASTParser  # Centralized AST processing
 
 class AIModifier:
     """Forcefully modifies AI functions using AST to ensure real self-modification."""
 
-    def __init__(self, file_path):
+    INDENT = "    "
+
+    def __init__(self, file_path, ast_parser=None, patch=True):
+        """With `patch=False` the whole module is regenerated (astor if installed, else ast.unparse)."""
         self.file_path = file_path
         self.utils = AIUtils(file_path)
-        self.ast_parser = AIASTParser(file_path)  # Use centralized AST processing
+        self.ast_parser = ast_parser or AIASTParser(file_path)  # Use centralized AST processing
+        self.patch = patch
 
     def modify_function(self, function_name, new_code=None):
         """Modifies only the target function without overwriting the entire file."""
-        tree = self.ast_parser.parse_code()  # Get AST from centralized parser
+        return self.modify_functions({function_name: new_code})[function_name]
+
+    def modify_functions(self, edits):
+        """
+        Rewrites several functions in one pass with one backup and one atomic write.
+        `edits` maps function names to their new body code (None inserts a placeholder).
+        Returns `{function_name: success}`.
+        """
+        if not edits:
+            return {}
+        if self.patch:
+            return self._patch_functions(edits)
+        return self._regenerate_functions(edits)
+
+    @staticmethod
+    def _matching_functions(tree, edits):
+        """Yields the function definitions named in `edits`, without descending into them."""
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, ast.FunctionDef) and node.name in edits:
+                yield node
+                continue
+            stack.extend(ast.iter_child_nodes(node))
+
+    def _new_body(self, function_name, new_code, indent):
+        """Source lines (bytes) of a replacement body; raises SyntaxError for invalid code."""
+        body = f'"""MODIFIED: AI has rewritten {function_name}"""\n'
+        if new_code:
+            new_code = textwrap.dedent(new_code).strip("\n") + "\n"
+            ast.parse(new_code)
+            body += new_code
+        else:
+            body += "pass\n"  # Placeholder if no new code
+        return textwrap.indent(body, indent).encode("utf-8")
+
+    def _patch_functions(self, edits):
+        """
+        Minimal-edit mode: splices each new body into the original text by line and column,
+        leaving comments and formatting elsewhere untouched. Each patched function is verified
+        by re-parsing only its own region, and the unchanged byte ranges are copied, not rebuilt.
+        """
+        results = {function_name: False for function_name in edits}
+        tree = self.ast_parser.parse_code()  # Read-only: only positions are used
+        if not tree:
+            logging.error("❌ AST Parsing failed. Aborting modification.")
+            return results
+
+        raw = self.utils.read_source_code().encode("utf-8")
+        lines = raw.splitlines(keepends=True)
+        offsets = [0]
+        for line in lines:
+            offsets.append(offsets[-1] + len(line))
+
+        patches = []
+        for node in self._matching_functions(tree, edits):
+            function_name = node.name
+            logging.info(f"🔄 Found '{function_name}', modifying...")
+            first = node.body[0]
+            first_line = lines[first.lineno - 1]
+            header_indent = lines[node.lineno - 1][:node.col_offset].decode("utf-8")
+            try:
+                if first_line[:first.col_offset].strip():  # Body shares the `def` line
+                    body_indent = header_indent + self.INDENT
+                    start = offsets[first.lineno - 1] + len(first_line[:first.col_offset].rstrip())
+                    prefix = b"\n"
+                else:
+                    body_indent = first_line[:first.col_offset].decode("utf-8")
+                    start = offsets[first.lineno - 1]
+                    prefix = b""
+                end_line = lines[node.end_lineno - 1]
+                tail = end_line[node.end_col_offset:]
+                end = offsets[node.end_lineno - 1] + node.end_col_offset + len(tail)
+                replacement = prefix + self._new_body(function_name, edits[function_name], body_indent)
+                if tail.strip():  # Keep a trailing comment on the last line
+                    replacement = replacement[:-1] + b"  " + tail.lstrip()
+
+                # Verify the patched function on its own, dedented to column 0
+                region_start = offsets[min([node.lineno] + [d.lineno for d in node.decorator_list]) - 1]
+                region = (raw[region_start:start] + replacement).decode("utf-8").splitlines(keepends=True)
+                column = node.col_offset
+                region = "".join(line[column:] if line[:column].isspace() else line for line in region)
+                patched = ast.parse(region).body[0]
+                if not isinstance(patched, ast.FunctionDef) or patched.name != function_name:
+                    raise SyntaxError(f"patched region no longer defines '{function_name}'")
+            except SyntaxError as e:
+                logging.error(f"❌ Failed to modify '{function_name}': Syntax error in new code → {e}")
+                continue
+
+            patches.append((start, end, replacement))
+            results[function_name] = True
+            logging.info(f"✅ Successfully modified '{function_name}'.")
+
+        for function_name, success in results.items():
+            if not success:
+                logging.error(f"❌ Function '{function_name}' was not modified.")
+        if not patches:
+            return results
+
+        patches.sort()
+        pieces, position = [], 0
+        for start, end, replacement in patches:
+            pieces += [raw[position:start], replacement]
+            position = end
+        pieces.append(raw[position:])
+
+        # Backup once before modifying the file
+        self.utils.create_backup()
+        self.utils.patch_source_code(patches, b"".join(pieces).decode("utf-8"))
+
+        modified = [function_name for function_name, success in results.items() if success]
+        AIMetrics.shared().incr("functions_rewritten", len(modified))
+        logging.info(f"✅ Patched {modified} in place ({sum(len(r) for _, _, r in patches)} bytes).")
+        return results
+
+    def _regenerate_functions(self, edits):
+        """Whole-module mode: one AST transformation and one serialization of the full file."""
+        results = {function_name: False for function_name in edits}
+
+        tree = self.ast_parser.parse_code(mutable=True)  # Private copy: the transformer edits it in place
         if not tree:
             logging.error("❌ AST Parsing failed. Aborting modification.")
-            return False
+            return results
 
         class FunctionRewriter(ast.NodeTransformer):
             def visit_FunctionDef(self, node):
-                if node.name == function_name:
+                if node.name in edits:
+                    function_name, new_code = node.name, edits[node.name]
                     logging.info(f"🔄 Found '{function_name}', modifying...")
 
                     try:
@@ -40,6 +165,7 @@ class AIModifier:
                             ast.Expr(ast.Constant(s=f"MODIFIED: AI has rewritten {function_name}"))
                         ] + parsed_code
 
+                        results[function_name] = True
                         logging.info(f"✅ Successfully modified '{function_name}'.")
 
                     except SyntaxError as e:
@@ -48,19 +174,33 @@ class AIModifier:
 
                 return node
 
-        # Apply AST transformation
+        # Apply all edits in a single AST transformation
         modified_tree = FunctionRewriter().visit(tree)
-        modified_code = astor.to_source(modified_tree)
+        for function_name, success in results.items():
+            if not success:
+                logging.error(f"❌ Function '{function_name}' was not modified.")
+
+        if not any(results.values()):
+            return results
+
+        try:
+            import astor  # type: ignore  # Optional; imported on first write to keep engine startup cheap
+            modified_code = astor.to_source(modified_tree)
+        except ImportError:
+            modified_code = ast.unparse(ast.fix_missing_locations(modified_tree)) + "\n"
 
-        # Prevent accidental overwrites by ensuring function still exists
-        if function_name not in modified_code:
-            logging.error(f"❌ Function '{function_name}' is missing in modified AST. Aborting write.")
-            return False
+        # Prevent accidental overwrites by ensuring every function still exists
+        missing = [function_name for function_name, success in results.items()
+                   if success and function_name not in modified_code]
+        if missing:
+            logging.error(f"❌ Functions {missing} are missing in modified AST. Aborting write.")
+            return {function_name: False for function_name in edits}
 
-        # Backup before modifying the file
+        # Backup once before modifying the file
         self.utils.create_backup()
-        with open(self.file_path, "w", encoding="utf-8") as file:
-            file.write(modified_code)
+        self.utils.write_source_code(modified_code)
 
-        logging.info(f"✅ Successfully modified '{function_name}' while preserving other functions.")
-        return True
+        modified = [function_name for function_name, success in results.items() if success]
+        AIMetrics.shared().incr("functions_rewritten", len(modified))
+        logging.info(f"✅ Successfully modified {modified} while preserving other functions.")
+        return results
@@ -0,0 +1,112 @@
+import ast
+import copy
+import hashlib
+import logging
+import os
+import threading
+from core_engine.execution.ai_metrics import AIMetrics
+
+
+class AISourceCache:
+    """Process-wide cache of source text and parsed ASTs shared by every AI module."""
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self._entries = {}  # path -> entry dict (stat key, hash, source, tree)
+        self._lock = threading.RLock()
+
+    @classmethod
+    def shared(cls):
+        """Returns the single cache instance used across the engine."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    @staticmethod
+    def _stat_key(path):
+        """Cheap change detector: (mtime_ns, size) of the file on disk."""
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _entry(self, path):
+        """Returns a fresh cache entry for `path`, reloading only if the file really changed."""
+        path = os.path.abspath(path)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File not found: {path}")
+
+        stat_key = self._stat_key(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry["stat"] == stat_key:
+                return entry
+
+            with open(path, "rb") as file:
+                raw = file.read()
+            AIMetrics.shared().incr("bytes_read", len(raw))
+            digest = hashlib.sha256(raw).hexdigest()
+
+            if entry is not None and entry["hash"] == digest:
+                entry["stat"] = stat_key  # Touched but identical: keep the parsed tree
+                return entry
+
+            entry = {
+                "stat": stat_key,
+                "hash": digest,
+                "source": raw.decode("utf-8"),
+                "tree": None,
+            }
+            self._entries[path] = entry
+            return entry
+
+    def get_source(self, path):
+        """Returns the current source text of `path`."""
+        return self._entry(path)["source"]
+
+    def get_hash(self, path):
+        """Returns the SHA-256 content hash of `path`."""
+        return self._entry(path)["hash"]
+
+    def cached_hash(self, path):
+        """Hash of the version last read or written through the cache, without checking disk; None if uncached."""
+        with self._lock:
+            entry = self._entries.get(os.path.abspath(path))
+            return entry["hash"] if entry is not None else None
+
+    def get_tree(self, path, mutable=False):
+        """
+        Returns the parsed AST of `path`. The shared tree must be treated as read-only;
+        callers that transform it pass `mutable=True` to get a private copy instead.
+        Raises SyntaxError if the file does not parse.
+        """
+        entry = self._entry(path)
+        with self._lock:
+            if entry["tree"] is None:
+                entry["tree"] = ast.parse(entry["source"])
+                AIMetrics.shared().incr("parses")
+            tree = entry["tree"]
+        return copy.deepcopy(tree) if mutable else tree
+
+    def update(self, path, source, tree=None):
+        """Records a write made by the engine so the next reader skips the re-read."""
+        path = os.path.abspath(path)
+        raw = source.encode("utf-8")
+        with self._lock:
+            self._entries[path] = {
+                "stat": self._stat_key(path),
+                "hash": hashlib.sha256(raw).hexdigest(),
+                "source": source,
+                "tree": tree,
+            }
+
+    def invalidate(self, path=None):
+        """Drops the cached entry for `path`, or every entry when no path is given."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(path), None)
+        logging.debug(f"🗑 Source cache invalidated: {path or 'all entries'}")
@@ -1,30 +1,101 @@
 import os
 import logging
+import tempfile
+from core_engine.execution.ai_metrics import AIMetrics
+from core_engine.modification.ai_source_cache import AISourceCache
 
 class AIUtils:
     def __init__(self, file_path):
         """Initialize AI Utilities with the file path."""
         self.file_path = file_path
+        self.cache = AISourceCache.shared()
+        self._snapshots = None
+
+    @property
+    def snapshots(self):
+        """Snapshot store of this file, created on first backup."""
+        if self._snapshots is None:
+            from core_engine.security.ai_snapshot_store import AISnapshotStore
+            self._snapshots = AISnapshotStore(self.file_path)
+        return self._snapshots
+
     def read_source_code(self):
         """Reads the AI's own source code safely."""
         self.file_path = os.path.abspath(self.file_path)  # Ensure absolute path
-        if not os.path.exists(self.file_path):
-            raise FileNotFoundError(f"File not found: {self.file_path}")
-        with open(self.file_path, "r", encoding="utf-8") as file:
-            return file.read()
+        return self.cache.get_source(self.file_path)
+    def write_source_code(self, source_code):
+        """Atomically replaces the source file (temp file + rename) and refreshes the shared cache."""
+        self.file_path = os.path.abspath(self.file_path)
+        directory = os.path.dirname(self.file_path)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".ai_write_", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                file.write(source_code)
+            AIMetrics.shared().incr("bytes_written", len(source_code.encode("utf-8")))
+            if os.path.exists(self.file_path):
+                os.chmod(temp_path, os.stat(self.file_path).st_mode & 0o7777)
+            os.replace(temp_path, self.file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.cache.update(self.file_path, source_code)
+
+    def patch_source_code(self, patches, source_code):
+        """
+        Atomically applies byte-range patches to the source file. `patches` is a sorted list of
+        `(start, end, replacement)` byte offsets into the current file, and `source_code` is the
+        resulting text for the cache. Unchanged ranges are copied in the kernel with
+        `os.copy_file_range` where available, so only the replacements pass through Python;
+        `bytes_written` still counts the whole output file.
+        """
+        self.file_path = os.path.abspath(self.file_path)
+        directory = os.path.dirname(self.file_path)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".ai_write_", suffix=".tmp")
+        try:
+            with open(self.file_path, "rb") as source, os.fdopen(fd, "wb") as target:
+                position = 0
+                for start, end, replacement in patches + [(os.fstat(source.fileno()).st_size, None, b"")]:
+                    self._copy_range(source, target, position, start - position)
+                    target.write(replacement)
+                    position = end
+                AIMetrics.shared().incr("bytes_written", target.tell())  # Whole file, like write_source_code
+            os.chmod(temp_path, os.stat(self.file_path).st_mode & 0o7777)
+            os.replace(temp_path, self.file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.cache.update(self.file_path, source_code)
+
+    @staticmethod
+    def _copy_range(source, target, offset, count):
+        """Copies `count` bytes from `offset` of `source` to the current end of `target`."""
+        target.flush()
+        copy_file_range = getattr(os, "copy_file_range", None)
+        while count > 0 and copy_file_range is not None:
+            try:
+                copied = copy_file_range(source.fileno(), target.fileno(), count, offset)
+            except OSError:  # e.g. unsupported filesystem: fall back to a userspace copy
+                break
+            if not copied:
+                break
+            offset += copied
+            count -= copied
+        if count > 0:
+            source.seek(offset)
+            target.write(source.read(count))
+        target.seek(0, os.SEEK_END)
+
     def create_backup(self):
-        """Creates a backup of the original source file before modification."""
-        backup_path = self.file_path + ".bak"
-        if os.path.exists(self.file_path):  # Ensure file exists before renaming
-            with open(self.file_path, "r", encoding="utf-8") as original, open(backup_path, "w", encoding="utf-8") as backup:
-                backup.write(original.read())  # Copy file content instead of renaming
-            logging.info(f"✅ Backup created: {backup_path}")
+        """Records the source file in the snapshot store before modification."""
+        if os.path.exists(self.file_path):  # Ensure file exists before snapshotting
+            generation = self.snapshots.commit(self.read_source_code().encode("utf-8"))
+            logging.info(f"✅ Backup created: generation {generation}")
 
     def restore_backup(self):
         """Restores the backup if needed."""
-        backup_path = self.file_path + ".bak"
-        if os.path.exists(backup_path):
-            os.rename(backup_path, self.file_path)
+        if self.snapshots.restore():
             logging.info("✅ Backup restored.")
         else:
-            logging.warning("⚠️ No backup found to restore.")
\ No newline at end of file
+            logging.warning("⚠️ No backup found to restore.")
@@ -1,25 +1,26 @@
-import shutil
-import os
 import logging
+from core_engine.security.ai_snapshot_store import AISnapshotStore
 
 class AIRollback:
     """Handles error detection and rollback in case of failures."""
     
-    def __init__(self, file_path):
+    def __init__(self, file_path, snapshots=None):
         self.file_path = file_path
-        self.backup_path = f"{file_path}.bak"
+        self.snapshots = snapshots or AISnapshotStore(file_path)  # Content-addressed generations
         
-    def create_backup(self):
-        """Creates a backup before modification."""
-        if not os.path.exists(self.backup_path):
-            shutil.copy(self.file_path, self.backup_path)
-            logging.info(f"✅ Backup created: {self.backup_path}")
+    def create_backup(self, source=None):
+        """
+        Records the current state (or `source`, read earlier) as a snapshot generation and
+        returns its number; keep it to restore this exact state later, since other writers
+        may commit newer generations in between. Identical states are deduplicated.
+        """
+        generation = self.snapshots.commit(None if source is None else source.encode("utf-8"))
+        logging.info(f"✅ Backup created: generation {generation}")
+        return generation
             
-    def restore_backup(self):
-        """Restores the AI to the last valid state if needed."""
-        if os.path.exists(self.backup_path):
-            shutil.copy(self.backup_path, self.file_path)
-            logging.info("✅ AI restored to last valid version.")
+    def restore_backup(self, generation=None):
+        """Restores the AI to a specific generation, or to the latest one when none is given."""
+        if self.snapshots.restore(generation):
+            logging.info(f"✅ AI restored to generation {generation or self.snapshots.latest()}.")
         else:
             logging.warning("⚠️ No backup found. Rollback not possible.")
-        
\ No newline at end of file
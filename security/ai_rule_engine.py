@@ -0,0 +1,129 @@
+import ast
+import hashlib
+import logging
+import threading
+from collections import OrderedDict, namedtuple
+
+AIRule = namedtuple("AIRule", "name node_types check group")
+AIVerdict = namedtuple("AIVerdict", "error violations functions")
+
+
+class AIRuleContext:
+    """Traversal state handed to every rule check."""
+
+    __slots__ = ("function_depth",)
+
+    def __init__(self):
+        self.function_depth = 0  # Number of enclosing function definitions
+
+
+class AIRuleEngine:
+    """
+    Policy rules keyed by AST node type, compiled into one dispatch table so every
+    registered rule runs in a single traversal of the candidate code. A check is
+    `check(node, context)` returning a violation message or None. Verdicts cover all
+    groups at once and are memoized by code hash, so identical candidates are never
+    parsed or walked twice; callers filter the verdict by the group they enforce.
+    """
+
+    MAX_CACHED_VERDICTS = 1024
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self._rules = {}  # name -> AIRule
+        self._dispatch = None  # node type -> tuple of rules
+        self._verdicts = OrderedDict()  # code hash -> AIVerdict
+        self._lock = threading.RLock()
+
+    @classmethod
+    def shared(cls):
+        """Returns the rule engine shared by every policy module."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    def register(self, name, node_types, check, group):
+        """
+        Adds (or replaces) a rule; cached verdicts are dropped since they lack it.
+        Registering an identical rule again is a no-op, so policies can register on every init.
+        """
+        if not isinstance(node_types, tuple):
+            node_types = (node_types,)
+        rule = AIRule(name, node_types, check, group)
+        with self._lock:
+            if self._rules.get(name) == rule:
+                return
+            self._rules[name] = rule
+            self._dispatch = None
+            self._verdicts.clear()
+
+    def rule(self, name, node_types, group):
+        """Decorator form of `register`."""
+        def decorator(check):
+            self.register(name, node_types, check, group)
+            return check
+        return decorator
+
+    def _compile(self):
+        dispatch = {}
+        for rule in self._rules.values():
+            for node_type in rule.node_types:
+                dispatch.setdefault(node_type, []).append(rule)
+        self._dispatch = {node_type: tuple(rules) for node_type, rules in dispatch.items()}
+        return self._dispatch
+
+    def _walk(self, tree, dispatch):
+        """One depth-first pass running every matching rule and collecting function names."""
+        context = AIRuleContext()
+        violations = []
+        functions = set()
+        stack = [(tree, 0)]
+        while stack:
+            node, depth = stack.pop()
+            context.function_depth = depth
+            if isinstance(node, ast.FunctionDef):
+                functions.add(node.name)
+            for rule in dispatch.get(type(node), ()):
+                message = rule.check(node, context)
+                if message:
+                    violations.append((rule.group, rule.name, message, getattr(node, "lineno", None)))
+            child_depth = depth + 1 if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) else depth
+            children = list(ast.iter_child_nodes(node))
+            stack.extend((child, child_depth) for child in reversed(children))  # Keep source order
+        return tuple(violations), frozenset(functions)
+
+    def evaluate(self, code):
+        """Returns the memoized AIVerdict of `code` across every registered rule."""
+        code_hash = hashlib.sha256(code.encode("utf-8")).hexdigest()
+        with self._lock:
+            verdict = self._verdicts.get(code_hash)
+            if verdict is not None:
+                self._verdicts.move_to_end(code_hash)
+                return verdict
+            dispatch = self._dispatch or self._compile()
+
+        try:
+            tree = ast.parse(code)
+        except SyntaxError as e:
+            verdict = AIVerdict(e, (), frozenset())
+        else:
+            verdict = AIVerdict(None, *self._walk(tree, dispatch))
+
+        with self._lock:
+            self._verdicts[code_hash] = verdict
+            if len(self._verdicts) > self.MAX_CACHED_VERDICTS:
+                self._verdicts.popitem(last=False)
+        logging.debug(f"🧾 Rule verdict cached for {code_hash[:12]}: {len(verdict.violations)} violations.")
+        return verdict
+
+    def violations(self, code, group):
+        """Returns `(rule, message, lineno)` for every violation of `group` in `code`; raises SyntaxError."""
+        verdict = self.evaluate(code)
+        if verdict.error is not None:
+            raise verdict.error
+        return [(name, message, lineno) for rule_group, name, message, lineno in verdict.violations
+                if rule_group == group]
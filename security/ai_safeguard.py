@@ -1,14 +1,161 @@
+import contextlib
+import hashlib
+import importlib.util
+import inspect
 import logging
+import os
+import signal
+import threading
+import time
 import traceback
+from core_engine.execution.ai_benchmark import CANDIDATE_VALUES
+from core_engine.execution.ai_sandbox import AISandbox
 from core_engine.security.ai_rollback import AIRollback
 
+
+def _smoke_call(function, recorded):
+    """Calls one function; returns `(status, error)` where status is passed, failed or inconclusive."""
+    if recorded:
+        for args in recorded:  # Recorded arguments are real calls: any failure counts
+            try:
+                function(*args)
+            except Exception as e:
+                return "failed", f"{type(e).__name__}: {e}"
+        return "passed", None
+
+    try:
+        parameters = inspect.signature(function).parameters.values()
+    except (TypeError, ValueError):
+        return "inconclusive", "no signature"
+    required = [p for p in parameters
+                if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) and p.default is p.empty]
+    if not required:
+        try:
+            function()
+        except Exception as e:
+            return "failed", f"{type(e).__name__}: {e}"
+        return "passed", None
+
+    last_error = None
+    for value in CANDIDATE_VALUES:  # Default arguments: one accepted tuple is enough
+        try:
+            function(*((value,) * len(required)))
+            return "passed", None
+        except Exception as e:
+            last_error = f"{type(e).__name__}: {e}"
+    return "inconclusive", last_error  # Cannot tell a broken function from one needing specific input
+
+
+class _CallTimeout(BaseException):
+    """Raised inside a smoke call that overran its deadline; not caught as a function error."""
+
+
+@contextlib.contextmanager
+def _deadline(seconds):
+    """Interrupts the block after `seconds` where SIGALRM is usable (the worker's main thread)."""
+    if not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def expire(*_):
+        raise _CallTimeout(f"no result within {seconds}s")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _construct(cls):
+    """
+    Builds an instance to call methods on; returns `(instance, exact)` or `(None, False)`.
+    `exact` is False when the constructor only accepted made-up candidate values.
+    """
+    try:
+        return cls(), True
+    except Exception:
+        pass
+    try:
+        parameters = list(inspect.signature(cls).parameters.values())
+    except (TypeError, ValueError):
+        return None, False
+    required = [p for p in parameters
+                if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) and p.default is p.empty]
+    for value in CANDIDATE_VALUES:
+        try:
+            return cls(*((value,) * len(required))), False
+        except Exception:
+            continue
+    return None, False
+
+
+_SEVERITY = {"passed": 0, "skipped": 1, "inconclusive": 2, "failed": 3}
+
+
+def _smoke_method(module, function_name, recorded):
+    """Smoke-calls the method `function_name` of every class defined in the module; worst outcome wins."""
+    outcome = ("skipped", "not a function or method of the module")
+    for cls in list(vars(module).values()):  # Smoke calls may add module globals
+        if not inspect.isclass(cls) or cls.__module__ != module.__name__ or function_name not in vars(cls):
+            continue
+        attribute = vars(cls)[function_name]
+        if isinstance(attribute, (staticmethod, classmethod)):
+            result = _smoke_call(getattr(cls, function_name), recorded)
+        else:
+            instance, exact = _construct(cls)
+            if instance is None:
+                result = ("inconclusive", f"could not construct {cls.__name__}")
+            else:
+                if isinstance(attribute, property):  # The changed function is the getter
+                    result = _smoke_call(lambda: getattr(instance, function_name), None)
+                else:
+                    result = _smoke_call(getattr(instance, function_name), recorded)
+                if result[0] == "failed" and not exact:
+                    result = ("inconclusive", result[1])  # The instance itself was built from guesses
+        if outcome[0] == "skipped" or _SEVERITY[result[0]] > _SEVERITY[outcome[0]]:
+            outcome = result
+    return outcome
+
+
+def _smoke_job(file_path, function_names, recorded_args, call_timeout):
+    """Runs in a sandbox worker: imports the module by path once and smoke-calls the named functions."""
+    module_name = "_genesisx_verify_" + hashlib.blake2b(file_path.encode(), digest_size=8).hexdigest()
+    start = time.perf_counter()
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)  # An import failure fails the whole job
+    report = {"import_seconds": time.perf_counter() - start, "functions": {}}
+
+    for function_name in function_names:
+        function = getattr(module, function_name, None)
+        start = time.perf_counter()
+        try:
+            with _deadline(call_timeout):
+                if inspect.isfunction(function):
+                    status, error = _smoke_call(function, recorded_args.get(function_name))
+                else:  # Methods run on an instance built with default or candidate arguments
+                    status, error = _smoke_method(module, function_name, recorded_args.get(function_name))
+        except _CallTimeout as e:
+            status, error = "inconclusive", str(e)  # Slow is not corrupt; a real hang still ends the job
+        report["functions"][function_name] = {"status": status, "error": error,
+                                              "seconds": time.perf_counter() - start}
+    return report
+
+
 class AISafeguard:
     """Monitors AI execution to detect instability and prevent self-corruption."""
 
-    def __init__(self, file_path):
+    IMPORT_TIMEOUT = 5.0
+    TIMEOUT_PER_FUNCTION = 1.0
+
+    def __init__(self, file_path, rollback=None, sandbox=None):
         """Initialize safeguard system with rollback capability."""
         self.file_path = file_path
-        self.rollback = AIRollback(file_path)
+        self.rollback = rollback or AIRollback(file_path)
+        self.sandbox = sandbox or AISandbox()
 
     def monitor_execution(self, execution_function):
         """
@@ -25,3 +172,49 @@ class AISafeguard:
             logging.info("🔄 Rolling back to last stable version due to corruption.")
             self.rollback.restore_backup()
             return False
+
+    def verify_changes(self, changed_functions, recorded_args=None, generation=None, rollback=True):
+        """
+        Verifies a modification out of process: a sandbox worker imports the module once and
+        smoke-calls only `changed_functions`, with recorded arguments when available and
+        default ones otherwise. Methods are called on an instance of their class. Cost scales
+        with the change, and a crash or hang only takes down the worker. Returns
+        `{"ok", "error", "elapsed", "import_seconds", "functions", "unverified"}`, where
+        `unverified` names the changed functions the verdict says nothing about. On failure
+        the file is restored to `generation` (the latest one when None) unless `rollback=False`.
+        """
+        changed_functions = sorted(changed_functions)
+        job = {
+            "target": "core_engine.security.ai_safeguard:_smoke_job",
+            "args": (os.path.abspath(self.file_path), changed_functions, dict(recorded_args or {}),
+                     self.TIMEOUT_PER_FUNCTION),
+        }
+        timeout = self.IMPORT_TIMEOUT + (self.TIMEOUT_PER_FUNCTION + 0.5) * len(changed_functions)
+        result = self.sandbox.pool.submit(job, timeout=timeout)
+
+        report = result["value"] or {}
+        functions = report.get("functions", {})
+        failed = [name for name, outcome in functions.items() if outcome["status"] == "failed"]
+        verdict = {
+            "ok": result["ok"] and not failed,
+            "error": "timed out" if result["timed_out"] else result["error"],
+            "elapsed": result["elapsed"],
+            "import_seconds": report.get("import_seconds"),
+            "functions": functions,
+            "unverified": sorted(name for name, outcome in functions.items()
+                                 if outcome["status"] in ("skipped", "inconclusive")),
+        }
+
+        if verdict["ok"]:
+            logging.info(f"✅ Verified {len(changed_functions)} changed functions out of process "
+                         f"in {verdict['elapsed'] * 1000:.0f} ms. No corruption detected.")
+            if verdict["unverified"]:
+                logging.warning(f"⚠️ Smoke calls were inconclusive for: {', '.join(verdict['unverified'])}")
+            return verdict
+
+        details = verdict["error"] or ", ".join(f"{name}: {functions[name]['error']}" for name in failed)
+        logging.error(f"❌ Out-of-process verification failed: {details}")
+        if rollback:
+            logging.info("🔄 Rolling back to last stable version due to corruption.")
+            self.rollback.restore_backup(generation)
+        return verdict
@@ -1,31 +1,46 @@
 import ast
 import logging
+from core_engine.security.ai_rule_engine import AIRuleEngine
 
 class AISecurity:
     """Enforces security layers to prevent AI from making unauthorized modifications."""
 
     PROTECTED_FUNCTIONS = {"run", "__init__", "monitor_execution"}
     UNSAFE_FUNCTION_CALLS = {"exec", "eval", "compile", "open", "__import__"}
+    RULE_GROUP = "security"
 
-    def __init__(self):
+    def __init__(self, rule_engine=None):
+        self.rule_engine = rule_engine or AIRuleEngine.shared()
+        for name, node_types, check in SECURITY_RULES:  # Every engine, shared or injected, carries them
+            self.rule_engine.register(name, node_types, check, self.RULE_GROUP)
         logging.info("🔒 AI Security Module Initialized.")
 
     def enforce_security_policies(self, modified_code):
         """Checks if the AI modification violates security policies."""
         try:
-            tree = ast.parse(modified_code)
-
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef) and node.name in self.PROTECTED_FUNCTIONS:
-                    logging.error(f"❌ Security Violation: Attempt to modify protected function '{node.name}'.")
-                    return False
-
-                if isinstance(node, ast.Call) and hasattr(node.func, "id") and node.func.id in self.UNSAFE_FUNCTION_CALLS:
-                    logging.error(f"❌ Security Violation: Detected use of unsafe function '{node.func.id}' in modification.")
-                    return False
+            violations = self.rule_engine.violations(modified_code, self.RULE_GROUP)
+            if violations:
+                logging.error(f"❌ Security Violation: {violations[0][1]}")
+                return False
 
             logging.info("✅ Security check passed. No unauthorized modifications detected.")
             return True
         except Exception as e:
             logging.error(f"❌ Security validation failed: {e}")
             return False
+
+
+def _protected_function(node, context):
+    if node.name in AISecurity.PROTECTED_FUNCTIONS:
+        return f"Attempt to modify protected function '{node.name}'."
+
+
+def _unsafe_call(node, context):
+    if isinstance(node.func, ast.Name) and node.func.id in AISecurity.UNSAFE_FUNCTION_CALLS:
+        return f"Detected use of unsafe function '{node.func.id}' in modification."
+
+
+SECURITY_RULES = (
+    ("protected_function", ast.FunctionDef, _protected_function),
+    ("unsafe_call", ast.Call, _unsafe_call),
+)
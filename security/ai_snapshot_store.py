@@ -0,0 +1,181 @@
+import contextlib
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import zlib
+from core_engine.modification.ai_source_cache import AISourceCache
+
+try:
+    import fcntl
+except ImportError:  # Not on Windows: commits there are serialised by O_EXCL numbering only
+    fcntl = None
+
+try:
+    import zstandard  # type: ignore
+except ImportError:  # Optional: zlib is always available
+    zstandard = None
+
+
+class AISnapshotStore:
+    """
+    Content-addressed snapshot store for one source file.
+
+    Blobs live in `.ai_snapshots/objects/<hh>/<sha256><suffix>`, compressed with zlib
+    (or zstd when `zstandard` is installed) and stored once per distinct content.
+    Each recorded state is a numbered generation file holding the blob hash, so
+    restoring any generation is a direct lookup. Restores always write a private
+    copy, so later in-place edits of the file can never reach the stored history.
+    """
+
+    STORE_DIR = ".ai_snapshots"
+    CODECS = {
+        "zlib": ".zz",
+        "zstd": ".zst",
+        None: "",
+    }
+
+    def __init__(self, file_path, compression="zlib"):
+        self.file_path = os.path.abspath(file_path)
+        if compression == "zstd" and zstandard is None:
+            logging.warning("⚠️ zstandard is not installed; snapshots fall back to zlib.")
+            compression = "zlib"
+        if compression not in self.CODECS:
+            raise ValueError(f"Unknown snapshot compression: {compression}")
+        self.compression = compression
+
+        root = os.path.join(os.path.dirname(self.file_path), self.STORE_DIR)
+        path_id = hashlib.sha256(self.file_path.encode("utf-8")).hexdigest()[:8]
+        self.objects_dir = os.path.join(root, "objects")
+        self.generations_dir = os.path.join(root, "generations",
+                                            f"{os.path.basename(self.file_path)}-{path_id}")
+
+    def _compress(self, data):
+        if self.compression == "zlib":
+            return zlib.compress(data, 6)
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor().compress(data)
+        return data
+
+    @staticmethod
+    def _decompress(codec, blob):
+        if codec == "zlib":
+            return zlib.decompress(blob)
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("Snapshot was compressed with zstd but zstandard is not installed")
+            return zstandard.ZstdDecompressor().decompress(blob)
+        return blob
+
+    def _object_path(self, content_hash, codec):
+        return os.path.join(self.objects_dir, content_hash[:2], content_hash + self.CODECS[codec])
+
+    @staticmethod
+    def _atomic_write(path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp_")
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+
+    def _read_generation(self, generation):
+        with open(os.path.join(self.generations_dir, f"{generation:08d}"), "r") as file:
+            content_hash, codec = file.read().split()
+        return content_hash, None if codec == "raw" else codec
+
+    def latest(self):
+        """Returns the newest generation number, or None if nothing was recorded."""
+        try:
+            with open(os.path.join(self.generations_dir, "HEAD"), "r") as file:
+                return int(file.read())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def generations(self):
+        """Lists every recorded generation number in order."""
+        if not os.path.isdir(self.generations_dir):
+            return []
+        return sorted(int(name) for name in os.listdir(self.generations_dir) if name.isdigit())
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """Holds an exclusive lock on this file's generations across processes."""
+        os.makedirs(self.generations_dir, exist_ok=True)
+        with open(os.path.join(self.generations_dir, "LOCK"), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def commit(self, data=None):
+        """
+        Records the file's current content (or `data`) as a new generation and returns
+        its number. A state identical to the latest generation records nothing new.
+        """
+        if data is None:
+            with open(self.file_path, "rb") as file:
+                data = file.read()
+        content_hash = hashlib.sha256(data).hexdigest()
+
+        object_path = self._object_path(content_hash, self.compression)
+        if not os.path.exists(object_path):  # Identical states share one blob
+            self._atomic_write(object_path, self._compress(data))
+
+        with self._locked():  # HEAD is read, incremented and written as one step
+            head = self.latest()
+            if head is not None and self._read_generation(head)[0] == content_hash:
+                return head
+            generation = (head or 0) + 1
+            while True:  # O_EXCL still guards numbering where no file lock is available
+                try:
+                    fd = os.open(os.path.join(self.generations_dir, f"{generation:08d}"),
+                                 os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+                    break
+                except FileExistsError:
+                    generation += 1
+            with os.fdopen(fd, "w") as file:
+                file.write(f"{content_hash} {self.compression or 'raw'}\n")
+            self._atomic_write(os.path.join(self.generations_dir, "HEAD"), str(generation).encode())
+        return generation
+
+    def read(self, generation=None):
+        """Returns the bytes recorded in a generation (the latest by default)."""
+        generation = self.latest() if generation is None else generation
+        if generation is None:
+            return None
+        content_hash, codec = self._read_generation(generation)
+        with open(self._object_path(content_hash, codec), "rb") as file:
+            return self._decompress(codec, file.read())
+
+    def restore(self, generation=None):
+        """Restores the file to a generation (the latest by default); returns False if none exists."""
+        generation = self.latest() if generation is None else generation
+        if generation is None:
+            return False
+        try:
+            content_hash, codec = self._read_generation(generation)
+        except FileNotFoundError:
+            return False
+
+        directory = os.path.dirname(self.file_path)
+        object_path = self._object_path(content_hash, codec)
+        mode = os.stat(self.file_path).st_mode & 0o777 if os.path.exists(self.file_path) else 0o644
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".ai_restore_")
+        try:
+            with os.fdopen(fd, "wb") as target:  # Written through mkstemp's own descriptor
+                with open(object_path, "rb") as source:
+                    if codec is None:
+                        shutil.copyfileobj(source, target)  # Never a hard link: the blob must stay immutable
+                    else:
+                        target.write(self._decompress(codec, source.read()))
+            os.chmod(temp_path, mode)
+            os.replace(temp_path, self.file_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        AISourceCache.shared().invalidate(self.file_path)
+        return True
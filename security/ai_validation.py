@@ -1,15 +1,22 @@
 import ast
 import logging
+from core_engine.modification.ai_source_cache import AISourceCache
+from core_engine.security.ai_rule_engine import AIRuleEngine
 
 class AIValidation:
     """Ensures AI modifications are valid before execution."""
 
+    RULE_GROUP = "validation"
+
+    def __init__(self, rule_engine=None):
+        self.rule_engine = rule_engine or AIRuleEngine.shared()
+        for name, node_types, check in VALIDATION_RULES:  # Every engine, shared or injected, carries them
+            self.rule_engine.register(name, node_types, check, self.RULE_GROUP)
+
     def validate_code(self, file_path):
         """Checks for syntax errors before applying modifications."""
         try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                source_code = file.read()
-            ast.parse(source_code)  # Attempt to parse the source code
+            AISourceCache.shared().get_tree(file_path)  # Parses once per file version
             logging.info("✅ Code validation successful. No syntax errors detected.")
             return True
         except SyntaxError as e:
@@ -19,11 +26,14 @@ class AIValidation:
     def analyze_modification(self, original_code, modified_code):
         """Compares AI-generated modifications before execution using AST."""
         try:
-            original_ast = ast.parse(original_code)
-            modified_ast = ast.parse(modified_code)
+            original_verdict = self.rule_engine.evaluate(original_code)
+            modified_verdict = self.rule_engine.evaluate(modified_code)
+            for verdict in (original_verdict, modified_verdict):
+                if verdict.error is not None:
+                    raise verdict.error
 
-            original_functions = {node.name for node in ast.walk(original_ast) if isinstance(node, ast.FunctionDef)}
-            modified_functions = {node.name for node in ast.walk(modified_ast) if isinstance(node, ast.FunctionDef)}
+            original_functions = set(original_verdict.functions)
+            modified_functions = set(modified_verdict.functions)
 
             if original_functions != modified_functions:
                 logging.warning(f"⚠️ Function structure changed. Original: {original_functions}, Modified: {modified_functions}")
@@ -37,23 +47,31 @@ class AIValidation:
     def validate_ast_modification(self, modified_code):
         """Runs deeper validation on the modified AST to detect anomalies."""
         try:
-            tree = ast.parse(modified_code)
-
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    # Ensure AI is not modifying critical functions
-                    if node.name in ["run", "__init__"]:  
-                        logging.error(f"❌ Modification attempt on protected function '{node.name}' detected! Aborting change.")
-                        return False
-
-                    # Prevent AI from inserting arbitrary exec() calls
-                    for sub_node in ast.walk(node):
-                        if isinstance(sub_node, ast.Call) and hasattr(sub_node.func, "id") and sub_node.func.id == "exec":
-                            logging.error("❌ Unsafe exec() call detected in modification. Aborting change.")
-                            return False
+            violations = self.rule_engine.violations(modified_code, self.RULE_GROUP)
+            if violations:
+                logging.error(f"❌ {violations[0][1]} Aborting change.")
+                return False
 
             logging.info("✅ AST validation successful. No unsafe modifications detected.")
             return True
         except Exception as e:
             logging.error(f"❌ AST validation failed: {e}")
             return False
+
+
+def _critical_function(node, context):
+    # Ensure AI is not modifying critical functions
+    if node.name in ("run", "__init__"):
+        return f"Modification attempt on protected function '{node.name}' detected!"
+
+
+def _exec_in_function(node, context):
+    # Prevent AI from inserting arbitrary exec() calls
+    if context.function_depth and isinstance(node.func, ast.Name) and node.func.id == "exec":
+        return "Unsafe exec() call detected in modification."
+
+
+VALIDATION_RULES = (
+    ("critical_function", ast.FunctionDef, _critical_function),
+    ("exec_in_function", ast.Call, _exec_in_function),
+)
@@ -0,0 +1,26 @@
+import importlib.util
+from core_engine.modification.ai_generated_store import AIGeneratedStore
+
+LEGACY_SOURCE = '''def ai_generated_1000(x):
+    return x * 1
+
+def ai_generated_1001(x):
+    return x + 1
+
+def ai_generated_1000(x):
+    return x * 2
+'''
+
+
+def test_legacy_import_keeps_the_last_definition_of_a_repeated_name(tmp_path):
+    legacy_path = tmp_path / AIGeneratedStore.LEGACY_FILE
+    legacy_path.write_text(LEGACY_SOURCE, encoding="utf-8")
+
+    spec = importlib.util.spec_from_file_location("legacy_ai_generated", legacy_path)
+    legacy = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(legacy)
+
+    store = AIGeneratedStore(str(tmp_path / "ai_core.py"))
+    for function_name in ("ai_generated_1000", "ai_generated_1001"):
+        assert store.load_function(function_name)(10) == getattr(legacy, function_name)(10)
+    assert store.load_function("ai_generated_1000")(10) == 20